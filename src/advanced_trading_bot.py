@@ -1,27 +1,62 @@
-import time
 from datetime import datetime
-from .strategies.combined_strategy import CombinedStrategy
+from typing import Dict, Optional
+from .strategies.combined_strategy import CombinedStrategy, strategy_config
 from .risk_management.position_sizer import PositionSizer
 from .utils.logger import setup_logger
 from .market_data.price_feed import PriceFeed
 from .portfolio.portfolio_manager import PortfolioManager
 from .config import load_config
+from .core.snapshot import SnapshotManager
+from .core.scheduler import DeadlineScheduler
+from .utils.profiler import LoopProfiler
 
 class AdvancedTradingBot:
-    def __init__(self):
+    def __init__(self, config: Optional[Dict] = None):
         self.logger = setup_logger()
-        self.config = load_config()
+        self.config = config or load_config()
+        self.snapshots = (
+            SnapshotManager(
+                self.config['snapshot_path'],
+                self.config.get('snapshot_interval', 300)
+            )
+            if self.config.get('snapshot_path') else None
+        )
+        snapshot = self.snapshots.load() if self.snapshots else None
         
-        self.price_feed = PriceFeed(self.config)
+        self.price_feed = PriceFeed(self.config, initialize=snapshot is None)
         self.portfolio = PortfolioManager(
             initial_balance=self.config.get('initial_balance', 10000),
             risk_percentage=self.config.get('risk_percentage', 1.0)
         )
         self.strategy = CombinedStrategy(self.config)
         self.position_sizer = PositionSizer(self.config)
+        self.profiler = LoopProfiler(self.config, 'advanced_bot')
+        self.scheduler = DeadlineScheduler()
         self.running = False
         self.last_update = None
 
+        if snapshot is not None:
+            self.snapshots.restore(self, snapshot)
+
+    def get_state(self):
+        return {
+            'config': self.config,
+            'price_feed': self.price_feed.get_state(),
+            'portfolio': self.portfolio.get_state(),
+            'strategy': vars(self.strategy)
+        }
+
+    def set_state(self, state):
+        self.price_feed.set_state(state['price_feed'])
+        self.portfolio.set_state(state['portfolio'])
+        # Indicator state is only valid for the parameters it was built with.
+        if strategy_config(state['config']) == strategy_config(self.config):
+            vars(self.strategy).update(state['strategy'])
+        else:
+            self.logger.warning(
+                "Strategy config changed since snapshot; strategy state not restored"
+            )
+
     def fetch_market_data(self):
         current_price = self.price_feed.get_latest_price()
         self.portfolio.update_value(current_price)
@@ -45,20 +80,38 @@ class AdvancedTradingBot:
             elif signals.action == 'sell' and self.portfolio.has_position:
                 self.portfolio.execute_sell(current_price)
 
+    def step(self):
+        with self.profiler.iteration():
+            current_price = self.fetch_market_data()
+            signals = self.generate_signals()
+            self.execute_trades(signals, current_price)
+            self.log_status(current_price)
+
     def run(self):
         self.logger.info("Starting advanced trading bot...")
         self.running = True
+        self.scheduler.every(
+            self.config.get('update_interval', 60), self.step, name='step'
+        )
+        if self.snapshots:
+            self.scheduler.every(
+                self.snapshots.interval, lambda: self.snapshots.save(self),
+                name='snapshot', align=False, offset=self.snapshots.interval
+            )
         
         try:
-            while self.running:
-                current_price = self.fetch_market_data()
-                signals = self.generate_signals()
-                self.execute_trades(signals, current_price)
-                self.log_status(current_price)
-                time.sleep(self.config.get('update_interval', 60))
+            self.scheduler.run()
         except KeyboardInterrupt:
             self.logger.info("Shutting down trading bot...")
+        finally:
             self.running = False
+            self.profiler.stop()
+            if self.snapshots:
+                self.snapshots.save(self)
+
+    def stop(self):
+        self.running = False
+        self.scheduler.stop()
 
     def log_status(self, current_price):
         status = self.portfolio.get_status()
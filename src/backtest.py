@@ -6,6 +6,7 @@ from typing import Dict, List
 from src.core.engine import TradingEngine
 from src.config import load_config
 from src.utils.logger import setup_logger
+from src.utils.analytics import compute_tearsheet
 
 class Backtester:
     def __init__(self, historical_data: pd.DataFrame, config: Dict):
@@ -23,7 +24,7 @@ class Backtester:
         for index, row in self.historical_data.iterrows():
             current_price = row['close']
             self.engine.price_feed.price_history.append(row.to_dict())
-            self.engine.update()
+            self.engine.process_price(current_price, row['timestamp'])
 
             current_portfolio_value = self.engine.portfolio.get_total_value(current_price)
             self.portfolio_value_history.append(current_portfolio_value)
@@ -34,11 +35,14 @@ class Backtester:
         final_portfolio_value = self.portfolio_value_history[-1]
         total_return = ((final_portfolio_value - self.portfolio_value_history[0]) / self.portfolio_value_history[0]) * 100
         max_drawdown = self._calculate_max_drawdown()
+        tearsheet = compute_tearsheet(self.portfolio_value_history)
 
         self.logger.info(f"Backtest completed.")
         self.logger.info(f"Final Portfolio Value: ${final_portfolio_value:.2f}")
         self.logger.info(f"Total Return: {total_return:.2f}%")
         self.logger.info(f"Max Drawdown: {max_drawdown:.2f}%")
+        self.logger.info(f"Sharpe Ratio: {tearsheet.sharpe[0]:.2f}")
+        self.logger.info(f"Sortino Ratio: {tearsheet.sortino[0]:.2f}")
 
     def _calculate_max_drawdown(self) -> float:
         peak = self.portfolio_value_history[0]
@@ -1,61 +1,220 @@
-import time
 from datetime import datetime
-from typing import Dict, Optional
-from ..strategies.combined_strategy import CombinedStrategy
+from typing import Dict, Optional, Tuple
+from ..strategies.combined_strategy import CombinedStrategy, strategy_config
 from ..risk_management.position_sizer import PositionSizer
+from ..risk_management.trigger_book import TriggerBook
 from ..utils.logger import get_logger
+from ..utils.profiler import LoopProfiler
 from ..market_data.price_feed import PriceFeed
+from ..market_data.order_book import BookFeatures, OrderBookFeed
 from ..portfolio.portfolio_manager import PortfolioManager
+from .snapshot import SnapshotManager
+from .recorder import SessionRecorder
+from .scheduler import DeadlineScheduler
 
 class TradingEngine:
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, exchange=None):
         self.logger = get_logger(__name__)
         self.config = config
-        self.price_feed = PriceFeed(config)
+        self.snapshots = (
+            SnapshotManager(
+                config['snapshot_path'],
+                config.get('snapshot_interval', 300)
+            )
+            if config.get('snapshot_path') else None
+        )
+        snapshot = self.snapshots.load() if self.snapshots else None
+
+        self.price_feed = PriceFeed(config, initialize=snapshot is None)
         self.portfolio = PortfolioManager(
             initial_balance=config.get('initial_balance', 10000),
             risk_percentage=config.get('risk_percentage', 1.0)
         )
         self.strategy = CombinedStrategy(config)
         self.position_sizer = PositionSizer(config)
+        self.trigger_book = TriggerBook()
+        self.symbol = config.get('symbol', 'BTC/USDT')
+        self.trailing_stop_percentage = config.get('trailing_stop_percentage')
+        self.position_id: Optional[int] = None
+        self.ticks_processed = 0
+        self.profiler = LoopProfiler(config, 'engine')
+        self.order_books = None
+        if config.get('use_order_book'):
+            if exchange is None:
+                self.logger.warning(
+                    "use_order_book needs an exchange to poll; trading without the book"
+                )
+            else:
+                self.order_books = OrderBookFeed(config, exchange=exchange)
+        self.scheduler = DeadlineScheduler()
         self.running = False
         self.last_update = None
 
+        if snapshot is not None:
+            self.snapshots.restore(self, snapshot)
+
+        self.recorder = (
+            SessionRecorder(config['record_path'])
+            if config.get('record_path') else None
+        )
+        if self.recorder:
+            self.recorder.start(self.get_state())
+
     def update(self) -> None:
         try:
             current_price = self.price_feed.get_latest_price()
-            self.portfolio.update_value(current_price)
-            
-            if self._should_update_signals():
-                signals = self.strategy.generate_signals(
-                    self.price_feed.get_historical_data()
-                )
-                
-                if signals.should_trade:
-                    position_size = self.position_sizer.calculate_position_size(
-                        self.portfolio.get_balance(),
-                        current_price,
-                        signals.risk_score
-                    )
-                    
-                    if signals.action == 'buy' and not self.portfolio.has_position:
-                        self.portfolio.execute_buy(current_price, position_size)
-                    elif signals.action == 'sell' and self.portfolio.has_position:
-                        self.portfolio.execute_sell(current_price)
-            
-            self._log_status(current_price)
-            
+            timestamp = self.price_feed.price_history[-1]['timestamp']
+            if self.recorder:
+                self.recorder.record_tick(current_price, timestamp)
+            self.process_price(current_price, timestamp, *self._poll_order_book())
         except Exception as e:
             self.logger.error(f"Error in trading update: {e}", exc_info=True)
 
-    def _should_update_signals(self) -> bool:
-        now = datetime.now()
+    def replay_tick(self, price: float, timestamp: datetime) -> None:
+        self.price_feed.push_price(price, timestamp)
+        self.process_price(price, timestamp)
+
+    def process_price(
+        self,
+        current_price: float,
+        timestamp: Optional[datetime] = None,
+        book_features: Optional[BookFeatures] = None,
+        liquidity: Optional[Dict[str, float]] = None
+    ) -> None:
+        """Run one trading step for a price already appended to the feed.
+
+        ``book_features`` and ``liquidity`` (see ``_poll_order_book``) let
+        the order book gate signals and cap position sizes.
+        """
+        self.ticks_processed += 1
+        self.portfolio.update_value(current_price)
+        self._enforce_exits(current_price)
+
+        if self._should_update_signals(timestamp or datetime.now()):
+            signals = self.strategy.generate_signals(
+                self.price_feed.get_historical_data(), book_features
+            )
+            if self.recorder:
+                self.recorder.record_signal(
+                    signals.action, signals.confidence, signals.risk_score
+                )
+            self._apply_signals(signals, current_price, liquidity)
+
+        self._log_status(current_price)
+
+    def _poll_order_book(self) -> Tuple[Optional[BookFeatures], Optional[Dict[str, float]]]:
+        """Refresh the book; return its features and fillable size per side."""
+        if not self.order_books:
+            return None, None
+        self.order_books.poll()
+        book = self.order_books.book(self.symbol)
+        if book.features is None:
+            return None, None
+        return book.features, {
+            side: book.available_liquidity(side, self.position_sizer.max_slippage_bps)
+            for side in ('buy', 'sell')
+        }
+
+    def _apply_signals(
+        self,
+        signals,
+        current_price: float,
+        liquidity: Optional[Dict[str, float]] = None
+    ) -> None:
+        if not signals.should_trade:
+            return
+
+        position_size = self.position_sizer.calculate_position_size(
+            self.portfolio.get_balance(),
+            current_price,
+            signals.risk_score
+        )
+        if liquidity is not None:
+            # Don't take more than the book fills within max_slippage_bps.
+            position_size = min(position_size, liquidity['buy'])
+
+        if signals.action == 'buy' and not self.portfolio.has_position:
+            if not position_size > 0:
+                # An empty book side or a zero risk score; nothing to open.
+                self.logger.info(f"Skipping buy of size {position_size}")
+                return
+            self._open_position(current_price, position_size)
+        elif signals.action == 'sell' and self.portfolio.has_position:
+            self._close_position(current_price)
+
+    def _open_position(self, price: float, size: float) -> None:
+        self.portfolio.execute_buy(price, size)
+        if not self.portfolio.has_position:
+            return
+        if self.recorder:
+            self.recorder.record_trade('buy', price, size)
+
+        self.position_id = self.trigger_book.add_position(
+            self.symbol,
+            'long',
+            price,
+            stop_loss=self.position_sizer.calculate_stop_loss(price),
+            take_profit=self.position_sizer.calculate_take_profit(price),
+            trailing_percentage=self.trailing_stop_percentage
+        )
+
+    def _close_position(self, price: float, action: str = 'sell') -> None:
+        if self.recorder and self.portfolio.has_position:
+            self.recorder.record_trade(
+                action, price, self.portfolio.current_position.size
+            )
+        if self.position_id is not None:
+            self.trigger_book.cancel(self.position_id)
+            self.position_id = None
+        self.portfolio.execute_sell(price)
+
+    def _enforce_exits(self, current_price: float) -> None:
+        for fill in self.trigger_book.on_price(self.symbol, current_price):
+            if fill.position_id != self.position_id:
+                continue
+
+            self.logger.info(
+                f"{fill.kind.replace('_', ' ').capitalize()} hit at "
+                f"${fill.price:.2f} (level ${fill.level:.2f})"
+            )
+            self.position_id = None
+            self._close_position(current_price, fill.kind)
+
+    def get_state(self) -> Dict:
+        return {
+            'config': self.config,
+            'price_feed': self.price_feed.get_state(),
+            'portfolio': self.portfolio.get_state(),
+            'strategy': vars(self.strategy),
+            'trigger_book': self.trigger_book,
+            'position_id': self.position_id,
+            'ticks_processed': self.ticks_processed,
+            'last_update': self.last_update
+        }
+
+    def set_state(self, state: Dict) -> None:
+        self.price_feed.set_state(state['price_feed'])
+        self.portfolio.set_state(state['portfolio'])
+        self.trigger_book = state['trigger_book']
+        self.position_id = state['position_id']
+        self.ticks_processed = state['ticks_processed']
+        self.last_update = state['last_update']
+
+        # Indicator state is only valid for the parameters it was built with.
+        if strategy_config(state['config']) == strategy_config(self.config):
+            vars(self.strategy).update(state['strategy'])
+        else:
+            self.logger.warning(
+                "Strategy config changed since snapshot; strategy state not restored"
+            )
+
+    def _should_update_signals(self, now: datetime) -> bool:
         if not self.last_update:
             self.last_update = now
             return True
             
         update_interval = self.config.get('update_interval', 60)
-        should_update = (now - self.last_update).seconds >= update_interval
+        should_update = (now - self.last_update).total_seconds() >= update_interval
         
         if should_update:
             self.last_update = now
@@ -71,14 +230,36 @@ class TradingEngine:
             f"Position: {status['position_type']}"
         )
 
+    def _scheduled_update(self) -> None:
+        with self.profiler.iteration():
+            self.update()
+
     def run(self) -> None:
         self.logger.info("Starting trading engine...")
         self.running = True
+        self.scheduler.every(
+            self.config.get('tick_interval', 1), self._scheduled_update,
+            name='update'
+        )
+        if self.snapshots:
+            self.scheduler.every(
+                self.snapshots.interval, lambda: self.snapshots.save(self),
+                name='snapshot', align=False, offset=self.snapshots.interval
+            )
         
         try:
-            while self.running:
-                self.update()
-                time.sleep(1)
+            self.scheduler.run()
         except KeyboardInterrupt:
             self.logger.info("Shutting down trading engine...")
-            self.running = False
\ No newline at end of file
+        finally:
+            self.running = False
+            self.profiler.stop()
+            if self.snapshots:
+                self.snapshots.save(self)
+            if self.recorder:
+                self.recorder.close()
+
+    def stop(self) -> None:
+        self.running = False
+        self.scheduler.stop()
+
@@ -0,0 +1,240 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from ..strategies.combined_strategy import CombinedStrategy
+from ..strategies.strategy import AdvancedStrategy
+from ..risk_management.position_sizer import PositionSizer
+from ..risk_management.trigger_book import TriggerBook
+from ..utils.logger import get_logger
+from ..market_data.price_feed import PriceFeed
+from ..portfolio.portfolio_manager import PortfolioManager
+from .scheduler import DeadlineScheduler
+
+STRATEGY_TYPES = {
+    'combined': CombinedStrategy,
+    'advanced': AdvancedStrategy,
+}
+
+INDICATOR_ATTRIBUTES = ('ema', 'rsi', 'bbands', 'gchannel')
+
+
+class SharedIndicatorCache:
+    """Computes each distinct indicator configuration once per bar.
+
+    Strategies hold their indicators as attributes; ``attach`` swaps them for
+    proxies keyed on the indicator type and its parameters, so two strategies
+    using e.g. ``EMAIndicator(20)`` share a single result for the bar. Only
+    the current bar's results are kept.
+    """
+
+    def __init__(self):
+        self._results: Dict[Tuple, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def begin_bar(self) -> None:
+        self._results.clear()
+
+    def attach(self, strategy: Any) -> None:
+        for attribute in INDICATOR_ATTRIBUTES:
+            indicator = getattr(strategy, attribute, None)
+            if indicator is not None and not isinstance(indicator, _SharedIndicator):
+                setattr(strategy, attribute, _SharedIndicator(indicator, self))
+
+    def compute(self, indicator: Any, prices) -> Any:
+        key = _indicator_key(indicator)
+        if key in self._results:
+            self.hits += 1
+            return self._results[key]
+
+        self.misses += 1
+        result = indicator.calculate(prices)
+        self._results[key] = result
+        return result
+
+
+class _SharedIndicator:
+    def __init__(self, indicator: Any, cache: SharedIndicatorCache):
+        self.indicator = indicator
+        self.cache = cache
+
+    def calculate(self, prices):
+        return self.cache.compute(self.indicator, prices)
+
+    def __getattr__(self, name: str) -> Any:
+        if name == 'indicator':
+            raise AttributeError(name)
+        return getattr(self.indicator, name)
+
+
+def _indicator_key(indicator: Any) -> Tuple:
+    params = tuple(sorted(
+        (name, value) for name, value in vars(indicator).items()
+        if isinstance(value, (int, float, str, bool))
+    ))
+    return (type(indicator).__name__, params)
+
+
+@dataclass
+class StrategySlot:
+    name: str
+    strategy: Any
+    portfolio: PortfolioManager
+    position_sizer: PositionSizer
+    last_action: str = 'hold'
+    signals_generated: int = 0
+    position_id: Optional[int] = None
+
+
+class MultiStrategyRunner:
+    """Hosts many strategy instances on one shared market data stream.
+
+    Every slot trades its own ``PortfolioManager`` while the feed buffer and
+    the per-bar indicator results are shared, so memory grows with the number
+    of strategies rather than strategies times history.
+    """
+
+    def __init__(self, config: Dict, strategies: Optional[List[Dict]] = None):
+        self.logger = get_logger(__name__)
+        self.config = config
+        self.price_feed = PriceFeed(config)
+        self.indicator_cache = SharedIndicatorCache()
+        self.trigger_book = TriggerBook()
+        self.symbol = config.get('symbol', 'BTC/USDT')
+        self.slots: List[StrategySlot] = []
+        self.scheduler = DeadlineScheduler()
+        self.running = False
+
+        for spec in strategies or config.get('strategies', [{'type': 'combined'}]):
+            self.add_strategy(spec)
+
+    def add_strategy(self, spec: Dict) -> StrategySlot:
+        strategy_type = spec.get('type', 'combined')
+        if strategy_type not in STRATEGY_TYPES:
+            raise ValueError(f"Unknown strategy type: {strategy_type}")
+
+        slot_config = {**self.config, **spec.get('params', {})}
+        name = spec.get('name', f"{strategy_type}-{len(self.slots)}")
+        if any(slot.name == name for slot in self.slots):
+            raise ValueError(f"Duplicate strategy name: {name}")
+
+        strategy = STRATEGY_TYPES[strategy_type](slot_config)
+        self.indicator_cache.attach(strategy)
+
+        slot = StrategySlot(
+            name=name,
+            strategy=strategy,
+            portfolio=PortfolioManager(
+                initial_balance=slot_config.get('initial_balance', 10000),
+                risk_percentage=slot_config.get('risk_percentage', 1.0)
+            ),
+            position_sizer=PositionSizer(slot_config)
+        )
+        self.slots.append(slot)
+        return slot
+
+    def update(self) -> None:
+        current_price = self.price_feed.get_latest_price()
+        # One buffer for every slot: strategies only read the history.
+        history = self.price_feed.price_history
+        self.indicator_cache.begin_bar()
+        self._enforce_exits(current_price)
+
+        for slot in self.slots:
+            try:
+                self._update_slot(slot, history, current_price)
+            except Exception as e:
+                self.logger.error(
+                    f"Error updating strategy {slot.name}: {e}", exc_info=True
+                )
+
+    def _update_slot(
+        self,
+        slot: StrategySlot,
+        history: List[Dict],
+        current_price: float
+    ) -> None:
+        slot.portfolio.update_value(current_price)
+        signals = slot.strategy.generate_signals(history)
+        slot.signals_generated += 1
+        slot.last_action = signals.action
+
+        if not signals.should_trade:
+            return
+
+        position_size = slot.position_sizer.calculate_position_size(
+            slot.portfolio.get_balance(),
+            current_price,
+            signals.risk_score
+        )
+
+        if signals.action == 'buy' and not slot.portfolio.has_position:
+            slot.portfolio.execute_buy(current_price, position_size)
+            if slot.portfolio.has_position:
+                slot.position_id = self.trigger_book.add_position(
+                    self.symbol,
+                    'long',
+                    current_price,
+                    stop_loss=slot.position_sizer.calculate_stop_loss(current_price),
+                    take_profit=slot.position_sizer.calculate_take_profit(current_price),
+                    trailing_percentage=self.config.get('trailing_stop_percentage')
+                )
+        elif signals.action == 'sell' and slot.portfolio.has_position:
+            if slot.position_id is not None:
+                self.trigger_book.cancel(slot.position_id)
+                slot.position_id = None
+            slot.portfolio.execute_sell(current_price)
+
+    def _enforce_exits(self, current_price: float) -> None:
+        fills = self.trigger_book.on_price(self.symbol, current_price)
+        if not fills:
+            return
+
+        slots = {slot.position_id: slot for slot in self.slots}
+        for fill in fills:
+            slot = slots.get(fill.position_id)
+            if slot is None:
+                continue
+            self.logger.info(
+                f"[{slot.name}] {fill.kind.replace('_', ' ')} hit at "
+                f"${fill.price:.2f}"
+            )
+            slot.position_id = None
+            slot.portfolio.execute_sell(current_price)
+
+    def get_results(self) -> Dict[str, Dict]:
+        results = {}
+        for slot in self.slots:
+            status = slot.portfolio.get_status()
+            status['total_trades'] = slot.portfolio.total_trades
+            status['last_action'] = slot.last_action
+            status['signals_generated'] = slot.signals_generated
+            results[slot.name] = status
+        return results
+
+    def _log_status(self) -> None:
+        for name, status in self.get_results().items():
+            self.logger.info(
+                f"[{name}] Portfolio: ${status['total_value']:.2f} | "
+                f"PnL: {status['pnl_percentage']:+.2f}% | "
+                f"Position: {status['position_type']}"
+            )
+
+    def step(self) -> None:
+        self.update()
+        self._log_status()
+
+    def run(self) -> None:
+        self.logger.info(
+            f"Starting multi-strategy runner with {len(self.slots)} strategies..."
+        )
+        self.running = True
+
+        self.scheduler.every(
+            self.config.get('update_interval', 60), self.step, name='update'
+        )
+
+        try:
+            self.scheduler.run()
+        except KeyboardInterrupt:
+            self.logger.info("Shutting down multi-strategy runner...")
+            self.running = False
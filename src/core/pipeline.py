@@ -0,0 +1,311 @@
+import queue
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from ..market_data.order_book import BookFeatures
+from ..ml.feature_pipeline import CloseWindow
+from ..strategies.combined_strategy import CombinedStrategy
+from .engine import TradingEngine
+from .scheduler import DeadlineScheduler
+
+
+@dataclass
+class Tick:
+    price: float
+    timestamp: datetime
+    history: List[Dict]
+    received: float
+    index: int = 0
+    book_features: Optional[BookFeatures] = None
+    liquidity: Optional[Dict[str, float]] = None
+    # (index, price) of ticks dropped from the execution queue since the
+    # last one that got through; execution still runs exits on them.
+    missed: List[Tuple[int, float]] = field(default_factory=list)
+
+
+class LatestValue:
+    """Single-slot handoff that always holds the newest value.
+
+    ``put`` never blocks: an unread value is replaced and counted as
+    coalesced, so a slow consumer only ever sees the freshest tick.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._value = None
+        self._has_value = False
+        self.coalesced = 0
+
+    def put(self, value: Any) -> None:
+        with self._condition:
+            if self._has_value:
+                self.coalesced += 1
+            self._value = value
+            self._has_value = True
+            self._condition.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        with self._condition:
+            if not self._condition.wait_for(lambda: self._has_value, timeout):
+                return None
+            value, self._value = self._value, None
+            self._has_value = False
+            return value
+
+
+# The process pool keeps its own strategy so only closes cross the boundary.
+_worker_strategy: Optional[CombinedStrategy] = None
+
+
+def _init_signal_worker(config: Dict) -> None:
+    global _worker_strategy
+    _worker_strategy = CombinedStrategy(config)
+
+
+def _evaluate_signals(window: CloseWindow, book_features: Optional[BookFeatures]):
+    return _worker_strategy.generate_signals(window, book_features)
+
+
+class PipelinedEngine(TradingEngine):
+    """TradingEngine with ingest, signal and execution running as stages.
+
+    - Ingest polls the feed (and the order book, with ``use_order_book``)
+      on the tick schedule and never blocks: ticks go
+      to the signal stage through a ``LatestValue`` (stale ticks coalesce)
+      and to execution through a bounded queue (dropped and counted when
+      full).
+    - Signal evaluation runs ``generate_signals`` on the newest tick, on its
+      own thread or in a worker process (``pipeline.signal_workers``), and
+      hands results to execution with a blocking put, so backpressure stops
+      at this stage.
+    - Execution marks the portfolio, enforces exits on every tick it
+      receives and on the prices of ticks dropped before it, records and
+      places orders, discarding signals older than
+      ``pipeline.max_signal_age`` seconds.
+
+    Each piece of state is owned by one stage: the feed by ingest, the
+    strategy by signals, and the portfolio and trigger book by execution.
+    Decisions are recorded by execution alone, tagged with the tick they
+    were made from. Snapshots are saved by execution too, with the history
+    of the last tick it handled and the signal stage held off by
+    ``strategy_lock``.
+    """
+
+    def __init__(self, config: Dict, exchange=None):
+        # Set first: TradingEngine.__init__ calls get_state when recording.
+        self.executed_history: Optional[List[Dict]] = None
+        super().__init__(config, exchange)
+        settings = config.get('pipeline') or {}
+        self.signal_workers = settings.get('signal_workers', 'thread')
+        self.max_signal_age = settings.get('max_signal_age', 5.0)
+
+        self.signal_input = LatestValue()
+        self.execution_queue: queue.Queue = queue.Queue(
+            maxsize=settings.get('execution_queue_size', 1024)
+        )
+        self.stop_event = threading.Event()
+        self.snapshot_due = threading.Event()
+        self.strategy_lock = threading.Lock()
+        self.threads: List[threading.Thread] = []
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.last_price: Optional[float] = None
+        self._missed: List[Tuple[int, float]] = []
+
+        self.ticks_ingested = 0
+        self.ticks_dropped = 0
+        self.signals_evaluated = 0
+        self.signals_stale = 0
+
+    def ingest(self) -> None:
+        try:
+            price = self.price_feed.get_latest_price()
+            timestamp = self.price_feed.price_history[-1]['timestamp']
+        except Exception as e:
+            self.logger.error(f"Error fetching price: {e}", exc_info=True)
+            return
+
+        if self.recorder:
+            self.recorder.record_tick(price, timestamp)
+        self.ticks_ingested += 1
+        # Ingest owns the book; later stages only see this tick's readings.
+        book_features, liquidity = self._poll_order_book()
+
+        tick = Tick(
+            price=price,
+            timestamp=timestamp,
+            history=self.price_feed.get_historical_data(),
+            received=time.monotonic(),
+            index=self.ticks_ingested,
+            book_features=book_features,
+            liquidity=liquidity,
+            missed=self._missed
+        )
+        # Queue the tick before the signal stage can see it, so execution
+        # always handles a tick before any signal computed from it.
+        try:
+            self.execution_queue.put_nowait(('tick', tick, None))
+            self._missed = []
+        except queue.Full:
+            self.ticks_dropped += 1
+            self._missed.append((tick.index, price))
+        self.signal_input.put(tick)
+
+    def _signal_stage(self) -> None:
+        while not self.stop_event.is_set():
+            tick = self.signal_input.get(timeout=0.1)
+            if tick is None or not self._should_update_signals(tick.timestamp):
+                continue
+
+            try:
+                with self.profiler.iteration(), self.strategy_lock:
+                    signals = self._evaluate(tick)
+            except Exception as e:
+                self.logger.error(f"Error generating signals: {e}", exc_info=True)
+                continue
+
+            self.signals_evaluated += 1
+            while not self.stop_event.is_set():
+                try:
+                    self.execution_queue.put(('signal', tick, signals), timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+
+    def _evaluate(self, tick: Tick):
+        if self.executor is None:
+            return self.strategy.generate_signals(tick.history, tick.book_features)
+        # The feed gains one candle per tick, so the tick index numbers the
+        # closes and the worker's features only take in the new ones.
+        closes = np.array([candle['close'] for candle in tick.history])
+        return self.executor.submit(
+            _evaluate_signals, CloseWindow(closes, tick.index), tick.book_features
+        ).result()
+
+    def _execution_stage(self) -> None:
+        while not self.stop_event.is_set():
+            if self.snapshot_due.is_set():
+                self.snapshot_due.clear()
+                self._save_snapshot()
+            try:
+                item = self.execution_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            self.execute(*item)
+
+    def execute(self, kind: str, tick: Tick, signals=None) -> None:
+        try:
+            if kind == 'tick':
+                self.executed_history = tick.history
+                for index, price in tick.missed + [(tick.index, tick.price)]:
+                    self._execute_tick(index, price)
+            else:
+                self._execute_signals(tick, signals)
+        except Exception as e:
+            self.logger.error(f"Error executing {kind}: {e}", exc_info=True)
+
+    def _execute_tick(self, index: int, price: float) -> None:
+        if self.recorder:
+            self.recorder.decision_tick = index
+        self.last_price = price
+        self.ticks_processed += 1
+        self.portfolio.update_value(price)
+        self._enforce_exits(price)
+
+    def _execute_signals(self, tick: Tick, signals) -> None:
+        if self.recorder:
+            self.recorder.decision_tick = tick.index
+            self.recorder.record_signal(
+                signals.action, signals.confidence, signals.risk_score
+            )
+        if time.monotonic() - tick.received > self.max_signal_age:
+            self.signals_stale += 1
+        else:
+            self._apply_signals(signals, self.last_price or tick.price, tick.liquidity)
+
+    def get_state(self) -> Dict:
+        state = super().get_state()
+        if self.executed_history is not None:
+            # The feed runs ahead of execution; save the history matching
+            # the portfolio instead.
+            state['price_feed'] = {'price_history': self.executed_history}
+        return state
+
+    def _save_snapshot(self) -> None:
+        with self.strategy_lock:
+            self.snapshots.save(self)
+
+    def get_pipeline_stats(self) -> Dict:
+        return {
+            'ticks_ingested': self.ticks_ingested,
+            'ticks_dropped': self.ticks_dropped,
+            'ticks_coalesced': self.signal_input.coalesced,
+            'signals_evaluated': self.signals_evaluated,
+            'signals_stale': self.signals_stale,
+            'execution_queue_depth': self.execution_queue.qsize()
+        }
+
+    def _log_pipeline_status(self) -> None:
+        if self.last_price is not None:
+            self._log_status(self.last_price)
+        self.logger.info(f"Pipeline: {self.get_pipeline_stats()}")
+
+    def start(self) -> None:
+        self.stop_event.clear()
+        if self.signal_workers == 'process':
+            self.executor = ProcessPoolExecutor(
+                max_workers=1,
+                initializer=_init_signal_worker,
+                initargs=(self.config,)
+            )
+
+        self.threads = [
+            threading.Thread(target=self._signal_stage, name='signals', daemon=True),
+            threading.Thread(target=self._execution_stage, name='execution', daemon=True)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def stop(self) -> None:
+        super().stop()
+        self.stop_event.set()
+        for thread in self.threads:
+            thread.join(timeout=5)
+        if self.executor is not None:
+            self.executor.shutdown(cancel_futures=True)
+            self.executor = None
+
+    def run(self) -> None:
+        self.logger.info("Starting pipelined trading engine...")
+        self.running = True
+        self.start()
+
+        self.scheduler = DeadlineScheduler()
+        self.scheduler.every(
+            self.config.get('tick_interval', 1), self.ingest, name='ingest'
+        )
+        self.scheduler.every(
+            self.config.get('update_interval', 60), self._log_pipeline_status,
+            name='status'
+        )
+        if self.snapshots:
+            self.scheduler.every(
+                self.snapshots.interval, self.snapshot_due.set,
+                name='snapshot', align=False, offset=self.snapshots.interval
+            )
+
+        try:
+            self.scheduler.run()
+        except KeyboardInterrupt:
+            self.logger.info("Shutting down pipelined trading engine...")
+        finally:
+            self.stop()
+            self.profiler.stop()
+            # Every stage has stopped, so this thread may read their state.
+            if self.snapshots:
+                self.snapshots.save(self)
+            if self.recorder:
+                self.recorder.close()
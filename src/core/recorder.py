@@ -0,0 +1,290 @@
+import math
+import pickle
+import struct
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from ..utils.logger import get_logger
+
+RECORDING_MAGIC = b'TBREC'
+RECORDING_VERSION = 1
+
+TICK, SIGNAL, TRADE = 0, 1, 2
+
+ACTIONS = (
+    'none', 'hold', 'buy', 'sell', 'stop_loss', 'take_profit', 'trailing_stop'
+)
+_ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+
+# magic, format version, length of the pickled initial state
+_HEADER = struct.Struct('<5sHI')
+# kind, action code, tick index, three values:
+#   tick:   timestamp, price, -
+#   signal: confidence, risk score, -
+#   trade:  price, size, -
+_RECORD = struct.Struct('<BBIddd')
+
+# Keys that only describe where a session writes its files; a replay must not
+# inherit them.
+RUNTIME_CONFIG_KEYS = ('snapshot_path', 'snapshot_interval', 'record_path')
+
+
+class Decision(NamedTuple):
+    kind: int
+    tick: int
+    action: str
+    values: Tuple[float, float]
+
+
+class DecisionCapture:
+    """Collects ticks and decisions in memory; the base for SessionRecorder."""
+
+    def __init__(self):
+        self.tick_index = 0
+        # Pipelined owners decide on ticks older than the newest one recorded;
+        # they set this to the tick their decisions are made from.
+        self.decision_tick: Optional[int] = None
+        self.decisions: List[Decision] = []
+
+    def start(self, state: Dict) -> None:
+        pass
+
+    def record_tick(self, price: float, timestamp: datetime) -> None:
+        self.tick_index += 1
+        self._write(TICK, 'none', timestamp.timestamp(), price)
+
+    def record_signal(
+        self,
+        action: str,
+        confidence: float = 0.0,
+        risk_score: float = 0.0
+    ) -> None:
+        self._write(SIGNAL, action, confidence, risk_score)
+
+    def record_trade(self, action: str, price: float, size: float) -> None:
+        self._write(TRADE, action, price, size)
+
+    def close(self) -> None:
+        pass
+
+    def _tick_for(self, kind: int) -> int:
+        if kind == TICK or self.decision_tick is None:
+            return self.tick_index
+        return self.decision_tick
+
+    def _write(self, kind: int, action: str, a: float, b: float) -> None:
+        if kind != TICK:
+            self.decisions.append(Decision(kind, self._tick_for(kind), action, (a, b)))
+
+
+class SessionRecorder(DecisionCapture):
+    """Appends every tick and decision of a live session to a compact file.
+
+    The file starts with the owner's ``get_state()`` so a replay begins from
+    exactly the same feed buffer and portfolio, followed by fixed-size
+    binary records. Writes are locked, so several threads may share one
+    recorder.
+    """
+
+    def __init__(self, path: str, flush_every: int = 256):
+        super().__init__()
+        self.path = path
+        self.flush_every = flush_every
+        self._buffer: List[bytes] = []
+        self._file = None
+        self._lock = threading.Lock()
+
+    def start(self, state: Dict) -> None:
+        payload = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        self._file = open(self.path, 'wb')
+        self._file.write(
+            _HEADER.pack(RECORDING_MAGIC, RECORDING_VERSION, len(payload))
+        )
+        self._file.write(payload)
+        self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is None:
+                return
+            self._flush()
+            self._file.close()
+            self._file = None
+
+    def _write(self, kind: int, action: str, a: float, b: float) -> None:
+        with self._lock:
+            if self._file is None:
+                return
+            self._buffer.append(_RECORD.pack(
+                kind, _ACTION_CODES[action], self._tick_for(kind), a, b, 0.0
+            ))
+            if len(self._buffer) >= self.flush_every:
+                self._flush()
+
+    def _flush(self) -> None:
+        self._file.write(b''.join(self._buffer))
+        self._file.flush()
+        self._buffer.clear()
+
+
+@dataclass
+class ReplayReport:
+    ticks: int
+    elapsed: float
+    recorded: List[Decision]
+    replayed: List[Decision]
+    mismatches: List[Tuple[Optional[Decision], Optional[Decision]]]
+    latencies: List[float] = field(repr=False, default_factory=list)
+
+    @property
+    def matches(self) -> bool:
+        return not self.mismatches
+
+    def latency_percentile(self, percentile: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * percentile / 100))
+        return ordered[index]
+
+    def summary(self) -> Dict:
+        return {
+            'ticks': self.ticks,
+            'elapsed': self.elapsed,
+            'ticks_per_second': self.ticks / self.elapsed if self.elapsed else 0,
+            'recorded_decisions': len(self.recorded),
+            'replayed_decisions': len(self.replayed),
+            'mismatches': len(self.mismatches),
+            'latency_p50_ms': self.latency_percentile(50) * 1000,
+            'latency_p99_ms': self.latency_percentile(99) * 1000,
+            'latency_max_ms': max(self.latencies, default=0.0) * 1000
+        }
+
+
+class SessionReplayer:
+    """Feeds a recording back through a target and diffs its decisions.
+
+    The target needs ``set_state``, ``replay_tick(price, timestamp)`` and a
+    ``recorder`` attribute, which ``TradingEngine`` and ``TradingBot`` both
+    provide. ``speed=None`` replays as fast as possible; otherwise ticks are
+    paced at ``speed`` times their recorded spacing.
+    """
+
+    def __init__(self, path: str):
+        self.logger = get_logger(__name__)
+        self.path = path
+
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        magic, version, state_length = _HEADER.unpack_from(data)
+        if magic != RECORDING_MAGIC:
+            raise ValueError(f"{path} is not a session recording")
+        if version != RECORDING_VERSION:
+            raise ValueError(f"Unsupported recording version {version} in {path}")
+
+        offset = _HEADER.size
+        self._state_payload = data[offset:offset + state_length]
+        offset += state_length
+
+        # A crashed session may leave a partial record at the end.
+        usable = (len(data) - offset) // _RECORD.size * _RECORD.size
+        self.ticks: List[Tuple[float, float]] = []
+        self.decisions: List[Decision] = []
+        for kind, code, tick, a, b, _ in _RECORD.iter_unpack(
+            data[offset:offset + usable]
+        ):
+            if kind == TICK:
+                self.ticks.append((a, b))
+            else:
+                self.decisions.append(Decision(kind, tick, ACTIONS[code], (a, b)))
+
+    @property
+    def state(self) -> Dict:
+        return pickle.loads(self._state_payload)
+
+    @property
+    def config(self) -> Dict:
+        config = dict(self.state.get('config', {}))
+        for key in RUNTIME_CONFIG_KEYS:
+            config.pop(key, None)
+        return config
+
+    def replay(
+        self,
+        target: Any,
+        speed: Optional[float] = None,
+        tolerance: float = 1e-9
+    ) -> ReplayReport:
+        target.set_state(self.state)
+        capture = DecisionCapture()
+        target.recorder = capture
+
+        latencies = []
+        started = time.monotonic()
+        first_timestamp = self.ticks[0][0] if self.ticks else 0.0
+
+        for timestamp, price in self.ticks:
+            if speed:
+                due = started + (timestamp - first_timestamp) / speed
+                delay = due - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+
+            capture.tick_index += 1
+            tick_started = time.perf_counter()
+            target.replay_tick(price, datetime.fromtimestamp(timestamp))
+            latencies.append(time.perf_counter() - tick_started)
+
+        report = ReplayReport(
+            ticks=len(self.ticks),
+            elapsed=time.monotonic() - started,
+            recorded=self.decisions,
+            replayed=capture.decisions,
+            mismatches=diff_decisions(self.decisions, capture.decisions, tolerance),
+            latencies=latencies
+        )
+        self.logger.info(f"Replayed {self.path}: {report.summary()}")
+        return report
+
+
+def diff_decisions(
+    recorded: List[Decision],
+    replayed: List[Decision],
+    tolerance: float = 1e-9
+) -> List[Tuple[Optional[Decision], Optional[Decision]]]:
+    mismatches = []
+    for index in range(max(len(recorded), len(replayed))):
+        expected = recorded[index] if index < len(recorded) else None
+        actual = replayed[index] if index < len(replayed) else None
+        if not _same_decision(expected, actual, tolerance):
+            mismatches.append((expected, actual))
+    return mismatches
+
+
+def _same_decision(
+    expected: Optional[Decision],
+    actual: Optional[Decision],
+    tolerance: float
+) -> bool:
+    if expected is None or actual is None:
+        return False
+    return (
+        expected.kind == actual.kind and
+        expected.tick == actual.tick and
+        expected.action == actual.action and
+        all(
+            math.isclose(a, b, rel_tol=tolerance, abs_tol=tolerance)
+            for a, b in zip(expected.values, actual.values)
+        )
+    )
+
+
+def replay_engine(path: str, speed: Optional[float] = None) -> ReplayReport:
+    """Replay a ``TradingEngine`` recording through a fresh engine."""
+    from .engine import TradingEngine
+
+    replayer = SessionReplayer(path)
+    return replayer.replay(TradingEngine(replayer.config), speed=speed)
@@ -0,0 +1,162 @@
+import heapq
+import itertools
+import math
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+from ..utils.logger import get_logger
+
+CATCH_UP = 'catch_up'
+SKIP = 'skip'
+
+
+@dataclass
+class Job:
+    name: str
+    callback: Callable[[], None]
+    period: float
+    policy: str = SKIP
+    max_catch_up: int = 10
+    deadline: float = 0.0
+    runs: int = 0
+    missed: int = 0
+    cancelled: bool = False
+    last_lateness: float = 0.0
+
+
+@dataclass(order=True)
+class _Entry:
+    deadline: float
+    sequence: int
+    job: Job = field(compare=False)
+
+
+class DeadlineScheduler:
+    """Runs periodic jobs at exact deadlines on the calling thread.
+
+    Deadlines live on the monotonic clock and advance by whole periods from
+    where they were scheduled, not from when the job finished, so processing
+    time and latency never accumulate as drift. Aligned jobs start on a
+    wall-clock multiple of their period (every minute on the minute for a
+    60s period). A job that falls behind either runs once per missed
+    deadline (``catch_up``, bounded by ``max_catch_up``) or runs once and
+    jumps to its next future deadline (``skip``). All jobs share one heap
+    and one sleeping thread.
+    """
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time
+    ):
+        self.logger = get_logger(__name__)
+        self.clock = clock
+        self.wall_clock = wall_clock
+        self._heap: List[_Entry] = []
+        self._sequence = itertools.count()
+        self._wakeup = threading.Event()
+        self.running = False
+
+    def every(
+        self,
+        period: float,
+        callback: Callable[[], None],
+        name: Optional[str] = None,
+        align: bool = True,
+        offset: float = 0.0,
+        policy: str = SKIP,
+        max_catch_up: int = 10
+    ) -> Job:
+        if period <= 0:
+            raise ValueError("Job period must be positive")
+        if policy not in (CATCH_UP, SKIP):
+            raise ValueError(f"Unknown missed-deadline policy: {policy}")
+
+        now = self.clock()
+        if align:
+            wall = self.wall_clock()
+            boundary = (math.floor((wall - offset) / period) + 1) * period + offset
+            deadline = now + (boundary - wall)
+        else:
+            deadline = now + offset
+
+        job = Job(
+            name=name or getattr(callback, '__name__', 'job'),
+            callback=callback,
+            period=period,
+            policy=policy,
+            max_catch_up=max_catch_up,
+            deadline=deadline
+        )
+        self._push(job)
+        return job
+
+    def cancel(self, job: Job) -> None:
+        # Lazily dropped when it reaches the top of the heap.
+        job.cancelled = True
+
+    def next_deadline(self) -> Optional[float]:
+        while self._heap and self._heap[0].job.cancelled:
+            heapq.heappop(self._heap)
+        return self._heap[0].deadline if self._heap else None
+
+    def run_pending(self) -> int:
+        """Run every job whose deadline has passed; return the number of runs."""
+        now = self.clock()
+        executed = 0
+
+        while self._heap and self._heap[0].deadline <= now:
+            job = heapq.heappop(self._heap).job
+            if job.cancelled:
+                continue
+
+            behind = int((now - job.deadline) // job.period)
+            if job.policy == CATCH_UP:
+                runs = min(behind + 1, job.max_catch_up)
+                job.missed += behind + 1 - runs
+            else:
+                runs = 1
+                job.missed += behind
+
+            job.last_lateness = now - job.deadline
+            for _ in range(runs):
+                self._execute(job)
+            executed += runs
+
+            job.deadline += (behind + 1) * job.period
+            if not job.cancelled:
+                self._push(job)
+            now = self.clock()
+
+        return executed
+
+    def run(self) -> None:
+        # Clear first, so a stop() once running is set always wakes the loop.
+        self._wakeup.clear()
+        self.running = True
+
+        while self.running:
+            deadline = self.next_deadline()
+            if deadline is None:
+                break
+
+            delay = deadline - self.clock()
+            if delay > 0 and self._wakeup.wait(delay):
+                self._wakeup.clear()
+                continue
+            self.run_pending()
+
+    def stop(self) -> None:
+        self.running = False
+        self._wakeup.set()
+
+    def _execute(self, job: Job) -> None:
+        job.runs += 1
+        try:
+            job.callback()
+        except Exception as e:
+            self.logger.error(f"Error in scheduled job {job.name}: {e}", exc_info=True)
+
+    def _push(self, job: Job) -> None:
+        heapq.heappush(self._heap, _Entry(job.deadline, next(self._sequence), job))
@@ -0,0 +1,510 @@
+import multiprocessing as mp
+import os
+import queue
+import time
+from multiprocessing import shared_memory
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
+from ..ml.feature_pipeline import CloseWindow
+from ..strategies.combined_strategy import CombinedStrategy
+from ..risk_management.position_sizer import PositionSizer
+from ..utils.logger import get_logger
+from ..market_data.price_feed import PriceFeed
+from ..portfolio.portfolio_manager import Position
+from .scheduler import DeadlineScheduler
+
+
+class ShardSignal(NamedTuple):
+    symbol: str
+    action: str
+    price: float
+    risk_score: float
+    confidence: float
+    worker_id: int
+
+
+class ShardFill(NamedTuple):
+    symbol: str
+    action: str
+    price: float
+    size: float
+
+
+class SharedPriceRing:
+    """Per-symbol ring buffers of closes in one shared-memory block.
+
+    Layout: write counters (int64, one per symbol), worker heartbeats
+    (float64, one per worker), then an ``n_symbols x capacity`` float64 price
+    matrix. There is a single writer (the supervisor); it stores the price
+    before bumping the counter, so readers never see a slot ahead of its data.
+    Readers working on a window in place check ``intact`` afterwards: the
+    writer may have lapped into its oldest slots meanwhile.
+    """
+
+    def __init__(
+        self,
+        n_symbols: int,
+        capacity: int,
+        n_workers: int,
+        name: Optional[str] = None
+    ):
+        self.n_symbols = n_symbols
+        self.capacity = capacity
+        self.n_workers = n_workers
+
+        size = 8 * (n_symbols + n_workers + n_symbols * capacity)
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(
+            name=name, create=self.owner, size=size
+        )
+
+        buf = self.shm.buf
+        self.counts = np.ndarray((n_symbols,), dtype=np.int64, buffer=buf)
+        self.heartbeats = np.ndarray(
+            (n_workers,), dtype=np.float64, buffer=buf, offset=8 * n_symbols
+        )
+        self.prices = np.ndarray(
+            (n_symbols, capacity), dtype=np.float64, buffer=buf,
+            offset=8 * (n_symbols + n_workers)
+        )
+        if self.owner:
+            self.counts[:] = 0
+            self.heartbeats[:] = 0
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    def write(self, index: int, price: float) -> None:
+        count = self.counts[index]
+        self.prices[index, count % self.capacity] = price
+        self.counts[index] = count + 1
+
+    def latest(self, index: int) -> Optional[float]:
+        count = self.counts[index]
+        if count == 0:
+            return None
+        return float(self.prices[index, (count - 1) % self.capacity])
+
+    def window(self, index: int, length: int, count: Optional[int] = None) -> np.ndarray:
+        """Last ``length`` prices in order; a view unless the window wraps.
+
+        Pass ``count`` to read the window as of that write count rather than
+        the current one.
+        """
+        count = int(self.counts[index]) if count is None else count
+        length = min(length, count, self.capacity)
+        end = count % self.capacity or self.capacity
+        start = end - length
+        row = self.prices[index]
+        if start >= 0:
+            return row[start:end]
+        return np.concatenate((row[start:], row[:end]))
+
+    def intact(self, index: int, count: int, length: int) -> bool:
+        """Whether a ``length`` window read at ``count`` is still unwritten."""
+        # Write number w lands on the slot of w - capacity while the counter
+        # reads w, so the window's oldest close survives until then.
+        return int(self.counts[index]) < count - length + self.capacity
+
+    def close(self) -> None:
+        # Views must be dropped before the mapping can be released.
+        del self.counts, self.heartbeats, self.prices
+        try:
+            self.shm.close()
+        except BufferError:
+            # A caller still holds a window view; the mapping goes with the process.
+            pass
+        if self.owner:
+            self.shm.unlink()
+
+
+def _worker_main(
+    worker_id: int,
+    shard: List[Tuple[int, str]],
+    ring_name: str,
+    layout: Tuple[int, int, int],
+    config: Dict,
+    signal_queue,
+    stop_event
+) -> None:
+    logger = get_logger(__name__)
+    ring = SharedPriceRing(*layout, name=ring_name)
+    history_size = config.get('history_size', 100)
+    min_history = config.get('min_history', 2)
+    poll_interval = config.get('worker_poll_interval', 0.01)
+
+    # One strategy for the shard so model scoring is batched across symbols.
+    strategy = CombinedStrategy(config)
+    # Start from the current position so a restarted worker skips old ticks.
+    seen = {index: int(ring.counts[index]) for index, _ in shard}
+    indices = {symbol: index for index, symbol in shard}
+
+    try:
+        while not stop_event.is_set():
+            ring.heartbeats[worker_id] = time.monotonic()
+            updated: Dict[str, CloseWindow] = {}
+
+            for index, symbol in shard:
+                count = int(ring.counts[index])
+                if count == seen[index] or count < min_history:
+                    continue
+                seen[index] = count
+                # Strategies read the ring in place; the count lets feature
+                # windows take in only the new closes.
+                updated[symbol] = CloseWindow(
+                    ring.window(index, history_size, count), count
+                )
+
+            if updated:
+                try:
+                    results = strategy.generate_signals_batch(updated)
+                except Exception as e:
+                    logger.error(f"Worker {worker_id} failed on {list(updated)}: {e}")
+                    results = {}
+
+                for symbol, signals in results.items():
+                    index, window = indices[symbol], updated[symbol]
+                    if not ring.intact(index, window.end, len(window.closes)):
+                        # More than ring_margin writes landed during the read;
+                        # drop the result and read the symbol again.
+                        logger.warning(f"Worker {worker_id} fell behind on {symbol}")
+                        seen[index] = -1
+                        continue
+                    if signals.should_trade:
+                        signal_queue.put(ShardSignal(
+                            symbol=symbol,
+                            action=signals.action,
+                            price=float(window.closes[-1]),
+                            risk_score=signals.risk_score,
+                            confidence=signals.confidence,
+                            worker_id=worker_id
+                        ))
+
+            if not updated:
+                time.sleep(poll_interval)
+    finally:
+        ring.close()
+
+
+class ShardPortfolio:
+    """One cash balance shared by every symbol of a sharded run.
+
+    Each symbol holds at most one long position. Buys are sized by the
+    ``PositionSizer`` from the whole portfolio's value, then cut to the cash
+    on hand and to what keeps the gross exposure of all open positions,
+    marked at ``latest_price``, within ``max_exposure_percentage`` of that
+    value.
+    """
+
+    def __init__(
+        self,
+        config: Dict,
+        latest_price: Callable[[str], Optional[float]]
+    ):
+        self.logger = get_logger(__name__)
+        self.position_sizer = PositionSizer(config)
+        self.latest_price = latest_price
+        self.initial_balance = config.get('initial_balance', 10000)
+        self.balance = self.initial_balance
+        self.max_exposure = config.get('max_exposure_percentage', 100.0) / 100
+        self.positions: Dict[str, Position] = {}
+        self.total_trades = 0
+        self.winning_trades = 0
+        self.total_pnl = 0.0
+
+    def get_exposure(self) -> float:
+        return sum(
+            position.size * (self.latest_price(symbol) or position.entry_price)
+            for symbol, position in self.positions.items()
+        )
+
+    def get_total_value(self) -> float:
+        return self.balance + self.get_exposure()
+
+    def buy(self, symbol: str, price: float, risk_score: float) -> float:
+        """Open a position in ``symbol``; return its size, 0 if none was opened."""
+        if symbol in self.positions:
+            return 0.0
+
+        exposure = self.get_exposure()
+        total_value = self.balance + exposure
+        size = self.position_sizer.calculate_position_size(
+            total_value, price, risk_score
+        )
+        headroom = min(self.balance, self.max_exposure * total_value - exposure)
+        size = min(size, max(headroom, 0.0) / price)
+        # Also rejects a NaN size from a risk score computed before warm-up.
+        if not size > 0:
+            self.logger.info(
+                f"Skipping {symbol} buy of {size} at exposure "
+                f"${exposure:.2f} of ${total_value:.2f}"
+            )
+            return 0.0
+
+        self._open(symbol, price, size)
+        return size
+
+    def _open(self, symbol: str, price: float, size: float) -> None:
+        self.balance -= price * size
+        self.positions[symbol] = Position(
+            entry_price=price, size=size, timestamp=str(datetime.now())
+        )
+
+    def sell(self, symbol: str, price: float) -> float:
+        """Close the position in ``symbol``; return its size, 0 if there was none."""
+        position = self.positions.pop(symbol, None)
+        if position is None:
+            return 0.0
+
+        self.balance += position.size * price
+        pnl = position.size * (price - position.entry_price)
+        self.total_trades += 1
+        self.winning_trades += pnl > 0
+        self.total_pnl += pnl
+        return position.size
+
+    def record(self, fill: ShardFill) -> None:
+        """Replay a fill made by the portfolio process on this copy."""
+        if fill.action == 'buy':
+            self._open(fill.symbol, fill.price, fill.size)
+        elif fill.action == 'sell':
+            self.sell(fill.symbol, fill.price)
+
+    def get_state(self) -> Dict:
+        state = vars(self).copy()
+        del state['logger'], state['latest_price'], state['position_sizer']
+        return state
+
+    def set_state(self, state: Dict) -> None:
+        for key, value in state.items():
+            setattr(self, key, value)
+
+
+def _portfolio_main(
+    symbols: List[str],
+    ring_name: str,
+    layout: Tuple[int, int, int],
+    config: Dict,
+    signal_queue,
+    fill_queue,
+    stop_event,
+    state: Optional[Dict] = None
+) -> None:
+    ring = SharedPriceRing(*layout, name=ring_name)
+    indices = {symbol: index for index, symbol in enumerate(symbols)}
+    portfolio = ShardPortfolio(
+        config, lambda symbol: ring.latest(indices[symbol])
+    )
+    if state is not None:
+        portfolio.set_state(state)
+
+    try:
+        while not stop_event.is_set():
+            try:
+                signal = signal_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            price = ring.latest(indices[signal.symbol]) or signal.price
+            if signal.action == 'buy':
+                size = portfolio.buy(signal.symbol, price, signal.risk_score)
+            elif signal.action == 'sell':
+                size = portfolio.sell(signal.symbol, price)
+            else:
+                size = 0.0
+            if size:
+                fill_queue.put(ShardFill(signal.symbol, signal.action, price, size))
+    finally:
+        ring.close()
+
+
+class ShardedRunner:
+    """Live runner that shards symbols across worker processes.
+
+    The supervisor writes prices into a ``SharedPriceRing``; each worker
+    evaluates ``CombinedStrategy`` for its shard straight from shared memory
+    and sends signals to a single portfolio/risk process, which reports fills
+    back. Workers that die or stop heartbeating are restarted. The supervisor
+    replays every fill on its own ``ShardPortfolio``, so a portfolio process
+    that dies is restarted from the last state it reported.
+    """
+
+    def __init__(
+        self,
+        config: Dict,
+        symbols: Optional[List[str]] = None,
+        price_source: Optional[Callable[[], Dict[str, float]]] = None
+    ):
+        self.logger = get_logger(__name__)
+        self.config = config
+        self.symbols = symbols or config.get('symbols') or [
+            config.get('symbol', 'BTC/USDT')
+        ]
+        self.n_workers = max(1, min(
+            config.get('workers') or os.cpu_count() or 1, len(self.symbols)
+        ))
+        self.worker_timeout = config.get('worker_timeout', 10)
+        self.price_source = price_source or self._synthetic_source()
+
+        # Slack beyond the window lets workers read it in place while the
+        # supervisor keeps writing; see SharedPriceRing.intact.
+        history_size = config.get('history_size', 100)
+        self.layout = (
+            len(self.symbols),
+            history_size + config.get('ring_margin', history_size),
+            self.n_workers
+        )
+        self.ring: Optional[SharedPriceRing] = None
+        self.shards = [
+            [
+                (index, symbol) for index, symbol in enumerate(self.symbols)
+                if index % self.n_workers == worker_id
+            ]
+            for worker_id in range(self.n_workers)
+        ]
+        self.workers: List[Optional[mp.Process]] = [None] * self.n_workers
+        self.portfolio_process: Optional[mp.Process] = None
+        self.portfolio = ShardPortfolio(config, self._latest_price)
+        self.signal_queue = mp.Queue()
+        self.fill_queue = mp.Queue()
+        self.stop_event = mp.Event()
+        self.fill_count = 0
+        self.restarts = 0
+        self.scheduler = DeadlineScheduler()
+        self.running = False
+
+    def _synthetic_source(self) -> Callable[[], Dict[str, float]]:
+        feeds = {symbol: PriceFeed(self.config) for symbol in self.symbols}
+        return lambda: {
+            symbol: feed.get_latest_price() for symbol, feed in feeds.items()
+        }
+
+    def _latest_price(self, symbol: str) -> Optional[float]:
+        if self.ring is None:
+            return None
+        return self.ring.latest(self.symbols.index(symbol))
+
+    def start(self) -> None:
+        self.ring = SharedPriceRing(*self.layout)
+        self.stop_event.clear()
+
+        self._start_portfolio()
+        for worker_id in range(self.n_workers):
+            self._start_worker(worker_id)
+
+        self.logger.info(
+            f"Started {self.n_workers} workers for {len(self.symbols)} symbols"
+        )
+
+    def _start_portfolio(self) -> None:
+        self.portfolio_process = mp.Process(
+            target=_portfolio_main,
+            args=(
+                self.symbols, self.ring.name, self.layout, self.config,
+                self.signal_queue, self.fill_queue, self.stop_event,
+                self.portfolio.get_state()
+            ),
+            name='portfolio',
+            daemon=True
+        )
+        self.portfolio_process.start()
+
+    def _start_worker(self, worker_id: int) -> None:
+        # A fresh heartbeat gives the new worker time to attach.
+        self.ring.heartbeats[worker_id] = time.monotonic()
+        worker = mp.Process(
+            target=_worker_main,
+            args=(
+                worker_id, self.shards[worker_id], self.ring.name, self.layout,
+                self.config, self.signal_queue, self.stop_event
+            ),
+            name=f"shard-{worker_id}",
+            daemon=True
+        )
+        worker.start()
+        self.workers[worker_id] = worker
+
+    def check_workers(self) -> None:
+        now = time.monotonic()
+        for worker_id, worker in enumerate(self.workers):
+            stale = now - self.ring.heartbeats[worker_id] > self.worker_timeout
+            if worker.is_alive() and not stale:
+                continue
+
+            self.logger.warning(
+                f"Worker {worker_id} "
+                f"{'stalled' if worker.is_alive() else 'died'}; restarting"
+            )
+            if worker.is_alive():
+                worker.terminate()
+            worker.join(timeout=1)
+            self.restarts += 1
+            self._start_worker(worker_id)
+
+        if not self.portfolio_process.is_alive():
+            self.logger.warning("Portfolio process died; restarting")
+            self.portfolio_process.join(timeout=1)
+            # Take in the fills it sent before dying; the restart starts there.
+            self.drain_fills()
+            self.restarts += 1
+            self._start_portfolio()
+
+    def publish_prices(self) -> None:
+        prices = self.price_source()
+        for index, symbol in enumerate(self.symbols):
+            price = prices.get(symbol)
+            if price is not None:
+                self.ring.write(index, price)
+
+    def drain_fills(self) -> List[ShardFill]:
+        drained = []
+        while True:
+            try:
+                fill = self.fill_queue.get_nowait()
+            except queue.Empty:
+                break
+            drained.append(fill)
+            self.portfolio.record(fill)
+            self.logger.info(
+                f"Fill: {fill.action} {fill.size:.6f} {fill.symbol} "
+                f"at ${fill.price:.2f}"
+            )
+        self.fill_count += len(drained)
+        return drained
+
+    def step(self) -> None:
+        self.publish_prices()
+        self.check_workers()
+        self.drain_fills()
+
+    def stop(self) -> None:
+        self.running = False
+        self.scheduler.stop()
+        self.stop_event.set()
+        for worker in self.workers + [self.portfolio_process]:
+            if worker is not None:
+                worker.join(timeout=5)
+                if worker.is_alive():
+                    worker.terminate()
+        self.drain_fills()
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
+    def run(self) -> None:
+        self.logger.info("Starting sharded runner...")
+        self.start()
+        self.running = True
+
+        self.scheduler.every(
+            self.config.get('update_interval', 60), self.step, name='sharded'
+        )
+
+        try:
+            self.scheduler.run()
+        except KeyboardInterrupt:
+            self.logger.info("Shutting down sharded runner...")
+        finally:
+            self.stop()
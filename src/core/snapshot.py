@@ -0,0 +1,111 @@
+import os
+import pickle
+import struct
+import tempfile
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+from ..utils.logger import get_logger
+
+SNAPSHOT_MAGIC = b'TBSNAP'
+SNAPSHOT_VERSION = 1
+
+# magic, format version, CRC32 of the payload, payload length
+_HEADER = struct.Struct('<6sHIQ')
+
+
+class SnapshotError(Exception):
+    pass
+
+
+def save_snapshot(path: str, state: Dict) -> int:
+    """Atomically write ``state`` to ``path`` and return the bytes written.
+
+    The payload goes to a temporary file in the same directory, is fsynced and
+    then renamed over the target, so a crash never leaves a torn snapshot.
+    """
+    payload = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+    header = _HEADER.pack(
+        SNAPSHOT_MAGIC, SNAPSHOT_VERSION, zlib.crc32(payload), len(payload)
+    )
+
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(header)
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, target)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    return len(header) + len(payload)
+
+
+def load_snapshot(path: str) -> Optional[Dict]:
+    """Read a snapshot written by ``save_snapshot``; ``None`` if there is none."""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        return None
+
+    if len(data) < _HEADER.size:
+        raise SnapshotError(f"Snapshot {path} is truncated")
+
+    magic, version, checksum, length = _HEADER.unpack_from(data)
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotError(f"{path} is not a snapshot file")
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {version} in {path}")
+
+    payload = data[_HEADER.size:]
+    if len(payload) != length or zlib.crc32(payload) != checksum:
+        raise SnapshotError(f"Snapshot {path} is corrupt")
+
+    return pickle.loads(payload)
+
+
+class SnapshotManager:
+    """Periodically snapshots an owner exposing ``get_state``/``set_state``."""
+
+    def __init__(self, path: str, interval: float = 300):
+        self.logger = get_logger(__name__)
+        self.path = path
+        self.interval = interval
+
+    def load(self) -> Optional[Dict]:
+        try:
+            return load_snapshot(self.path)
+        except SnapshotError as e:
+            self.logger.error(f"Ignoring snapshot: {e}")
+            return None
+
+    def restore(self, owner: Any, state: Optional[Dict] = None) -> bool:
+        if state is None:
+            state = self.load()
+        if state is None:
+            return False
+
+        started = time.perf_counter()
+        owner.set_state(state)
+        self.logger.info(
+            f"Restored snapshot {self.path} "
+            f"({(time.perf_counter() - started) * 1000:.1f} ms)"
+        )
+        return True
+
+    def save(self, owner: Any) -> None:
+        try:
+            state = owner.get_state()
+            state['saved_at'] = time.time()
+            size = save_snapshot(self.path, state)
+            self.logger.debug(f"Saved snapshot {self.path} ({size} bytes)")
+        except Exception as e:
+            self.logger.error(f"Error saving snapshot: {e}", exc_info=True)
@@ -0,0 +1,22 @@
+from typing import Optional, Sequence, Tuple
+import numpy as np
+from .backend import IndicatorBackend, get_backend
+from .custom import GChannel
+from .momentum import RSIIndicator
+from .trend import EMAIndicator
+from .volatility import BollingerBands
+
+
+def calculateEMA(prices: Sequence[float], period: int) -> Optional[float]:
+    """Latest EMA of ``prices``, or None until there are ``period`` of them."""
+    if len(prices) < period:
+        return None
+    return float(get_backend().ema(prices, period)[-1])
+
+
+def calculateGChannel(prices: Sequence[float], length: int) -> Tuple[str, Optional[float]]:
+    """G-Channel signal and latest channel average for ``prices``."""
+    if not len(prices):
+        return 'hold', None
+    result = GChannel(length).calculate(np.asarray(prices, dtype=np.float64))
+    return result.signal, result.avg[-1]
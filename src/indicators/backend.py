@@ -0,0 +1,261 @@
+import math
+from typing import Dict, Optional, Sequence, Tuple
+import numpy as np
+from ..utils.logger import get_logger
+
+try:
+    import talib
+except ImportError:
+    talib = None
+
+INDICATORS = ('ema', 'rsi', 'bbands', 'gchannel')
+
+# Each block of the closed-form smoothing ends before w ** k decays below
+# this, which keeps w ** -k well inside float64 range.
+_MIN_BLOCK_WEIGHT = 1e-100
+
+
+def _as_float64(prices: Sequence[float]) -> np.ndarray:
+    return np.ascontiguousarray(prices, dtype=np.float64)
+
+
+class IndicatorBackend:
+    """Computes indicator series for a whole price array.
+
+    Every backend follows TA-Lib's conventions so results are
+    interchangeable: series are as long as the input with NaN until the
+    indicator has warmed up, the EMA is seeded with the SMA of its first
+    ``period`` prices, RSI uses Wilder smoothing and Bollinger Bands use
+    the population standard deviation around an SMA.
+    """
+
+    name = 'base'
+
+    def ema(self, prices: Sequence[float], period: int) -> np.ndarray:
+        raise NotImplementedError
+
+    def rsi(self, prices: Sequence[float], period: int) -> np.ndarray:
+        raise NotImplementedError
+
+    def bbands(
+        self,
+        prices: Sequence[float],
+        period: int,
+        num_std: float = 2.0
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        raise NotImplementedError
+
+    def gchannel(
+        self,
+        prices: Sequence[float],
+        length: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        # The recurrence is non-linear, so no backend can vectorize it;
+        # looping over Python floats beats indexing NumPy scalars.
+        values = _as_float64(prices).tolist()
+        upper = [0.0] * len(values)
+        lower = [0.0] * len(values)
+        if values:
+            high = low = values[0]
+            upper[0] = lower[0] = high
+            for i in range(1, len(values)):
+                price = values[i]
+                width = (high - low) / length
+                high = (price if price > high else high) - width
+                low = (price if price < low else low) + width
+                upper[i] = high
+                lower[i] = low
+        return np.array(upper), np.array(lower)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+
+class NumpyBackend(IndicatorBackend):
+    """Vectorized NumPy implementation; always available."""
+
+    name = 'numpy'
+
+    def ema(self, prices: Sequence[float], period: int) -> np.ndarray:
+        prices = _as_float64(prices)
+        result = np.full(len(prices), np.nan)
+        if period < 1 or len(prices) < period:
+            return result
+        seed = prices[:period].mean()
+        result[period - 1] = seed
+        result[period:] = _smooth(prices[period:], 2 / (period + 1), seed)
+        return result
+
+    def rsi(self, prices: Sequence[float], period: int) -> np.ndarray:
+        prices = _as_float64(prices)
+        result = np.full(len(prices), np.nan)
+        if period < 1 or len(prices) <= period:
+            return result
+
+        changes = np.diff(prices)
+        gains = np.maximum(changes, 0)
+        losses = np.maximum(-changes, 0)
+        alpha = 1 / period
+        average_gain = np.concatenate((
+            [gains[:period].mean()],
+            _smooth(gains[period:], alpha, gains[:period].mean())
+        ))
+        average_loss = np.concatenate((
+            [losses[:period].mean()],
+            _smooth(losses[period:], alpha, losses[:period].mean())
+        ))
+
+        total = average_gain + average_loss
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result[period:] = np.where(total > 0, 100 * average_gain / total, 0.0)
+        return result
+
+    def bbands(
+        self,
+        prices: Sequence[float],
+        period: int,
+        num_std: float = 2.0
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        prices = _as_float64(prices)
+        middle = np.full(len(prices), np.nan)
+        deviation = np.full(len(prices), np.nan)
+        if period >= 1 and len(prices) >= period:
+            # Two passes over strided windows: running sums of squares
+            # cancel catastrophically once prices drift far from the start.
+            windows = np.lib.stride_tricks.sliding_window_view(prices, period)
+            mean = windows.mean(axis=1)
+            middle[period - 1:] = mean
+            deviation[period - 1:] = np.sqrt(
+                np.square(windows - mean[:, None]).mean(axis=1)
+            )
+        band = num_std * deviation
+        return middle + band, middle, middle - band
+
+
+class TalibBackend(IndicatorBackend):
+    """TA-Lib's C implementation; requires the ``ta-lib`` package."""
+
+    name = 'talib'
+
+    def __init__(self):
+        if talib is None:
+            raise ImportError("TA-Lib is not installed")
+
+    def ema(self, prices: Sequence[float], period: int) -> np.ndarray:
+        prices = _as_float64(prices)
+        if len(prices) < period:
+            return np.full(len(prices), np.nan)
+        return talib.EMA(prices, timeperiod=period)
+
+    def rsi(self, prices: Sequence[float], period: int) -> np.ndarray:
+        prices = _as_float64(prices)
+        if len(prices) <= period:
+            return np.full(len(prices), np.nan)
+        return talib.RSI(prices, timeperiod=period)
+
+    def bbands(
+        self,
+        prices: Sequence[float],
+        period: int,
+        num_std: float = 2.0
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        prices = _as_float64(prices)
+        if len(prices) < period:
+            empty = np.full(len(prices), np.nan)
+            return empty, empty.copy(), empty.copy()
+        return talib.BBANDS(
+            prices, timeperiod=period, nbdevup=num_std, nbdevdn=num_std, matype=0
+        )
+
+
+class CompositeBackend(IndicatorBackend):
+    """Routes each indicator to its own backend, e.g. the fastest one."""
+
+    name = 'composite'
+
+    def __init__(self, choices: Dict[str, IndicatorBackend]):
+        self.choices = choices
+        fallback = NumpyBackend()
+        for indicator in INDICATORS:
+            setattr(self, indicator, getattr(choices.get(indicator, fallback), indicator))
+
+    def __getstate__(self) -> Dict:
+        return {'choices': self.choices}
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__init__(state['choices'])
+
+    def __repr__(self) -> str:
+        routes = ', '.join(
+            f"{indicator}={backend.name}" for indicator, backend in self.choices.items()
+        )
+        return f"CompositeBackend({routes})"
+
+
+BACKENDS = {
+    'numpy': NumpyBackend,
+    'talib': TalibBackend,
+}
+
+_instances: Dict[str, IndicatorBackend] = {}
+
+
+def available_backends() -> Dict[str, IndicatorBackend]:
+    backends = {}
+    for name, backend_class in BACKENDS.items():
+        try:
+            backends[name] = backend_class()
+        except ImportError:
+            continue
+    return backends
+
+
+def get_backend(name: Optional[str] = None) -> IndicatorBackend:
+    """Backend by name, cached for the process.
+
+    ``auto`` (the default) prefers TA-Lib when it is installed and falls
+    back to NumPy; ``fastest`` checks every available backend for parity
+    and picks the fastest correct one per indicator.
+    """
+    name = name or 'auto'
+    if name not in _instances:
+        if name == 'auto':
+            backends = available_backends()
+            _instances[name] = backends.get('talib') or backends['numpy']
+        elif name == 'fastest':
+            from .benchmark import select_fastest
+            _instances[name] = select_fastest()
+        elif name in BACKENDS:
+            _instances[name] = BACKENDS[name]()
+        else:
+            raise ValueError(f"Unknown indicator backend: {name}")
+        get_logger(__name__).info(
+            f"Using indicator backend {_instances[name]!r} for '{name}'"
+        )
+    return _instances[name]
+
+
+def _smooth(values: np.ndarray, alpha: float, initial: float) -> np.ndarray:
+    """``y[t] = y[t-1] + alpha * (x[t] - y[t-1])`` starting from ``initial``.
+
+    Unrolled in closed form, ``y[t] = w**(t+1) * initial + alpha * w**t *
+    sum(w**-k * x[k])`` with ``w = 1 - alpha``, which is a cumulative sum.
+    The series is processed in blocks short enough that ``w**-k`` cannot
+    overflow, carrying the last value into the next block.
+    """
+    result = np.empty(len(values))
+    weight = 1 - alpha
+    if weight <= 0:
+        result[:] = values
+        return result
+
+    block = max(1, int(math.log(_MIN_BLOCK_WEIGHT) / math.log(weight)))
+    previous = initial
+    for start in range(0, len(values), block):
+        chunk = values[start:start + block]
+        steps = np.arange(len(chunk))
+        decay = weight ** steps
+        smoothed = decay * weight * previous + alpha * decay * np.cumsum(chunk / decay)
+        result[start:start + len(chunk)] = smoothed
+        previous = smoothed[-1]
+    return result
@@ -0,0 +1,241 @@
+import sys
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from ..utils.logger import get_logger
+from .backend import (
+    INDICATORS, CompositeBackend, IndicatorBackend, NumpyBackend, available_backends
+)
+
+# Lengths around each warm-up boundary plus longer series, and periods up
+# to a slow moving average (TA-Lib rejects periods below 2).
+PARITY_LENGTHS = (0, 1, 2, 13, 14, 15, 19, 20, 21, 100, 5000)
+PARITY_PERIODS = (2, 5, 14, 20, 50)
+
+
+class ReferenceBackend(IndicatorBackend):
+    """Straightforward loops written from the indicator definitions.
+
+    Slow, but simple enough to check by eye; every other backend is
+    compared against it.
+    """
+
+    name = 'reference'
+
+    def ema(self, prices: Sequence[float], period: int) -> np.ndarray:
+        prices = list(map(float, prices))
+        result = [np.nan] * len(prices)
+        if len(prices) >= period:
+            value = sum(prices[:period]) / period
+            result[period - 1] = value
+            alpha = 2 / (period + 1)
+            for i in range(period, len(prices)):
+                value = alpha * prices[i] + (1 - alpha) * value
+                result[i] = value
+        return np.array(result)
+
+    def rsi(self, prices: Sequence[float], period: int) -> np.ndarray:
+        prices = list(map(float, prices))
+        result = [np.nan] * len(prices)
+        if len(prices) > period:
+            changes = [b - a for a, b in zip(prices, prices[1:])]
+            gain = sum(max(c, 0) for c in changes[:period]) / period
+            loss = sum(max(-c, 0) for c in changes[:period]) / period
+            for i in range(period, len(prices)):
+                if i > period:
+                    change = changes[i - 1]
+                    gain = (gain * (period - 1) + max(change, 0)) / period
+                    loss = (loss * (period - 1) + max(-change, 0)) / period
+                result[i] = 100 * gain / (gain + loss) if gain + loss else 0.0
+        return np.array(result)
+
+    def bbands(
+        self,
+        prices: Sequence[float],
+        period: int,
+        num_std: float = 2.0
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        prices = list(map(float, prices))
+        upper, middle, lower = ([np.nan] * len(prices) for _ in range(3))
+        for i in range(period - 1, len(prices)):
+            window = prices[i - period + 1:i + 1]
+            mean = sum(window) / period
+            deviation = (sum((p - mean) ** 2 for p in window) / period) ** 0.5
+            middle[i] = mean
+            upper[i] = mean + num_std * deviation
+            lower[i] = mean - num_std * deviation
+        return np.array(upper), np.array(middle), np.array(lower)
+
+    def gchannel(self, prices: Sequence[float], length: int) -> Tuple[np.ndarray, np.ndarray]:
+        prices = np.asarray(prices, dtype=np.float64)
+        upper = np.zeros_like(prices)
+        lower = np.zeros_like(prices)
+        if len(prices):
+            upper[0] = lower[0] = prices[0]
+        for i in range(1, len(prices)):
+            upper[i] = max(prices[i], upper[i-1]) - (upper[i-1] - lower[i-1]) / length
+            lower[i] = min(prices[i], lower[i-1]) + (upper[i-1] - lower[i-1]) / length
+        return upper, lower
+
+
+@dataclass
+class ParityFailure:
+    backend: str
+    indicator: str
+    length: int
+    period: int
+    max_error: float
+
+    def __str__(self) -> str:
+        return (
+            f"{self.backend}.{self.indicator} (length={self.length}, "
+            f"period={self.period}): max error {self.max_error:.3g}"
+        )
+
+
+def _calls(period: int) -> Dict[str, Callable]:
+    return {
+        'ema': lambda backend, prices: (backend.ema(prices, period),),
+        'rsi': lambda backend, prices: (backend.rsi(prices, period),),
+        'bbands': lambda backend, prices: backend.bbands(prices, period, 2.0),
+        'gchannel': lambda backend, prices: backend.gchannel(prices, period),
+    }
+
+
+def sample_prices(length: int, seed: int = 0) -> np.ndarray:
+    """A random walk with a flat stretch, so zero changes are exercised too."""
+    rng = np.random.default_rng(seed)
+    prices = 2000 * np.exp(np.cumsum(rng.normal(0, 0.01, length)))
+    if length > 40:
+        prices[20:40] = prices[20]
+    return prices
+
+
+def check_parity(
+    backend: IndicatorBackend,
+    reference: Optional[IndicatorBackend] = None,
+    rtol: float = 1e-9,
+    lengths: Sequence[int] = PARITY_LENGTHS,
+    periods: Sequence[int] = PARITY_PERIODS
+) -> List[ParityFailure]:
+    """Compare every indicator of ``backend`` with ``reference``.
+
+    Outputs must have the same NaN warm-up and agree to ``rtol`` (relative
+    to the price scale) everywhere else. Returns the failures, if any.
+    """
+    reference = reference or ReferenceBackend()
+    failures = []
+    for length in lengths:
+        prices = sample_prices(length)
+        scale = float(np.abs(prices).max()) if length else 1.0
+        for period in periods:
+            for indicator, call in _calls(period).items():
+                # RSI is bounded by 100 rather than the price.
+                tolerance = rtol * (100 if indicator == 'rsi' else scale)
+                try:
+                    error = _max_error(call(backend, prices), call(reference, prices))
+                except Exception:
+                    error = np.inf
+                if not error <= tolerance:
+                    failures.append(ParityFailure(
+                        backend.name, indicator, length, period, error
+                    ))
+    return failures
+
+
+def _max_error(actual: Tuple[np.ndarray, ...], expected: Tuple[np.ndarray, ...]) -> float:
+    worst = 0.0
+    for a, e in zip(actual, expected):
+        a, e = np.asarray(a, dtype=np.float64), np.asarray(e, dtype=np.float64)
+        if a.shape != e.shape or not np.array_equal(np.isnan(a), np.isnan(e)):
+            return np.inf
+        if a.size:
+            worst = max(worst, float(np.nanmax(np.abs(a - e), initial=0.0)))
+    return worst
+
+
+def benchmark(
+    backends: Dict[str, IndicatorBackend],
+    length: int = 1000,
+    period: int = 20,
+    min_time: float = 0.2
+) -> Dict[str, Dict[str, float]]:
+    """Seconds per call of each indicator on each backend (best of runs)."""
+    prices = sample_prices(length)
+    timings: Dict[str, Dict[str, float]] = {indicator: {} for indicator in INDICATORS}
+    for name, backend in backends.items():
+        for indicator, call in _calls(period).items():
+            timings[indicator][name] = _time(lambda: call(backend, prices), min_time)
+    return timings
+
+
+def _time(function: Callable[[], object], min_time: float) -> float:
+    function()
+    best = float('inf')
+    runs, started = 0, time.perf_counter()
+    while runs < 3 or time.perf_counter() - started < min_time:
+        began = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - began)
+        runs += 1
+    return best
+
+
+def select_fastest(
+    backends: Optional[Dict[str, IndicatorBackend]] = None,
+    length: int = 1000,
+    period: int = 20
+) -> CompositeBackend:
+    """Pick, per indicator, the fastest backend that passes ``check_parity``."""
+    logger = get_logger(__name__)
+    backends = backends or available_backends()
+
+    correct: Dict[str, Dict[str, IndicatorBackend]] = {i: {} for i in INDICATORS}
+    for name, backend in backends.items():
+        failed = {failure.indicator for failure in check_parity(backend)}
+        for indicator in INDICATORS:
+            if indicator in failed:
+                logger.warning(f"Backend {name} fails parity for {indicator}")
+            else:
+                correct[indicator][name] = backend
+
+    timings = benchmark(backends, length, period)
+    choices = {}
+    for indicator, candidates in correct.items():
+        if candidates:
+            fastest = min(candidates, key=lambda name: timings[indicator][name])
+            choices[indicator] = candidates[fastest]
+        else:
+            choices[indicator] = NumpyBackend()
+    return CompositeBackend(choices)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Check every available backend for parity and compare their speed."""
+    argv = sys.argv[1:] if argv is None else argv
+    length = int(argv[0]) if argv else 1000
+    backends = available_backends()
+    failed = False
+
+    for name, backend in backends.items():
+        failures = check_parity(backend)
+        failed = failed or bool(failures)
+        print(f"{name}: {'parity ok' if not failures else f'{len(failures)} parity failures'}")
+        for failure in failures[:20]:
+            print(f"  {failure}")
+
+    timings = benchmark(backends, length)
+    names = list(backends)
+    print(f"\n{'indicator':<10}" + ''.join(f"{name:>12}" for name in names)
+          + f"   (µs per call, {length} prices)")
+    for indicator, by_backend in timings.items():
+        print(f"{indicator:<10}" + ''.join(
+            f"{by_backend[name] * 1e6:12.1f}" for name in names
+        ))
+    print(f"\nfastest correct: {select_fastest(backends, length)!r}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,7 @@
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import List, Dict, Optional
 import numpy as np
+from .backend import IndicatorBackend, get_backend
 
 @dataclass
 class GChannelResult:
@@ -10,23 +11,13 @@ class GChannelResult:
     avg: List[float]
 
 class GChannel:
-    def __init__(self, length: int = 10):
+    def __init__(self, length: int = 10, backend: Optional[IndicatorBackend] = None):
         self.length = length
+        self.backend = backend or get_backend()
 
     def calculate(self, prices: np.ndarray) -> GChannelResult:
-        upper = np.zeros_like(prices)
-        lower = np.zeros_like(prices)
-        
-        upper[0] = lower[0] = prices[0]
-        
-        for i in range(1, len(prices)):
-            upper[i] = max(prices[i], upper[i-1]) - (
-                upper[i-1] - lower[i-1]
-            ) / self.length
-            
-            lower[i] = min(prices[i], lower[i-1]) + (
-                upper[i-1] - lower[i-1]
-            ) / self.length
+        prices = np.asarray(prices, dtype=np.float64)
+        upper, lower = self.backend.gchannel(prices, self.length)
         
         avg = (upper + lower) / 2
         
@@ -42,4 +33,4 @@ class GChannel:
             upper=upper.tolist(),
             lower=lower.tolist(),
             avg=avg.tolist()
-        )
\ No newline at end of file
+        )
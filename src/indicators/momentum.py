@@ -0,0 +1,12 @@
+from typing import Optional
+import numpy as np
+from .backend import IndicatorBackend, get_backend
+
+
+class RSIIndicator:
+    def __init__(self, period: int = 14, backend: Optional[IndicatorBackend] = None):
+        self.period = period
+        self.backend = backend or get_backend()
+
+    def calculate(self, prices: np.ndarray) -> np.ndarray:
+        return self.backend.rsi(prices, self.period)
@@ -0,0 +1,12 @@
+from typing import Optional
+import numpy as np
+from .backend import IndicatorBackend, get_backend
+
+
+class EMAIndicator:
+    def __init__(self, period: int = 20, backend: Optional[IndicatorBackend] = None):
+        self.period = period
+        self.backend = backend or get_backend()
+
+    def calculate(self, prices: np.ndarray) -> np.ndarray:
+        return self.backend.ema(prices, self.period)
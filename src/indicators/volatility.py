@@ -0,0 +1,27 @@
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+from .backend import IndicatorBackend, get_backend
+
+
+@dataclass
+class BollingerBandsResult:
+    upper: np.ndarray
+    middle: np.ndarray
+    lower: np.ndarray
+
+
+class BollingerBands:
+    def __init__(
+        self,
+        period: int = 20,
+        num_std: float = 2.0,
+        backend: Optional[IndicatorBackend] = None
+    ):
+        self.period = period
+        self.num_std = num_std
+        self.backend = backend or get_backend()
+
+    def calculate(self, prices: np.ndarray) -> BollingerBandsResult:
+        upper, middle, lower = self.backend.bbands(prices, self.period, self.num_std)
+        return BollingerBandsResult(upper=upper, middle=middle, lower=lower)
@@ -1,4 +1,5 @@
 from .core.engine import TradingEngine
+from .core.pipeline import PipelinedEngine
 from .core.config import load_config
 from .utils.logger import setup_logger
 
@@ -6,7 +7,10 @@ def main():
     logger = setup_logger()
     config = load_config()
     
-    engine = TradingEngine(config)
+    if config.get('pipeline', {}).get('enabled'):
+        engine = PipelinedEngine(config)
+    else:
+        engine = TradingEngine(config)
     engine.run()
 
 if __name__ == "__main__":
@@ -0,0 +1,306 @@
+import json
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+import numpy as np
+from ..utils.logger import get_logger
+
+
+@dataclass
+class BookFeatures:
+    best_bid: float
+    best_ask: float
+    mid: float
+    spread: float
+    spread_bps: float
+    microprice: float
+    imbalance: float
+    bid_depth: float
+    ask_depth: float
+
+
+@dataclass
+class SlippageEstimate:
+    average_price: float
+    slippage_bps: float
+    filled: float
+
+
+class _BookSide:
+    """One side of the book in preallocated arrays, best level first.
+
+    Levels are kept sorted by ``key`` (the price for asks, minus the price
+    for bids) so lookups are a binary search and inserts/deletes shift the
+    arrays in place without allocating.
+    """
+
+    def __init__(self, max_levels: int, sign: float):
+        self.sign = sign
+        self.keys = np.empty(max_levels)
+        self.sizes = np.empty(max_levels)
+        self.count = 0
+
+    @property
+    def prices(self) -> np.ndarray:
+        return self.sign * self.keys[:self.count]
+
+    def clear(self) -> None:
+        self.count = 0
+
+    def load(self, levels: Sequence[Sequence[float]]) -> None:
+        levels = np.asarray(levels, dtype=np.float64).reshape(-1, 2)
+        levels = levels[levels[:, 1] > 0]
+        keys = self.sign * levels[:, 0]
+        order = np.argsort(keys, kind='stable')[:len(self.keys)]
+        self.count = len(order)
+        self.keys[:self.count] = keys[order]
+        self.sizes[:self.count] = levels[order, 1]
+
+    def update(self, price: float, size: float) -> None:
+        key = self.sign * price
+        count = self.count
+        index = int(np.searchsorted(self.keys[:count], key))
+        exists = index < count and self.keys[index] == key
+
+        if size <= 0:
+            if exists:
+                self.keys[index:count - 1] = self.keys[index + 1:count]
+                self.sizes[index:count - 1] = self.sizes[index + 1:count]
+                self.count -= 1
+            return
+
+        if exists:
+            self.sizes[index] = size
+            return
+
+        capacity = len(self.keys)
+        if index >= capacity:
+            # Worse than every level we track.
+            return
+        end = min(count, capacity - 1)
+        self.keys[index + 1:end + 1] = self.keys[index:end]
+        self.sizes[index + 1:end + 1] = self.sizes[index:end]
+        self.keys[index] = key
+        self.sizes[index] = size
+        self.count = end + 1
+
+    def walk(self, quantity: float) -> Tuple[float, float]:
+        """Notional and size filled by taking ``quantity`` from this side."""
+        sizes = self.sizes[:self.count]
+        cumulative = np.cumsum(sizes)
+        full = int(np.searchsorted(cumulative, quantity))
+        prices = self.prices
+        notional = float(np.dot(prices[:full], sizes[:full]))
+        filled = float(cumulative[full - 1]) if full else 0.0
+        if full < self.count:
+            rest = quantity - filled
+            notional += rest * prices[full]
+            filled = quantity
+        return notional, filled
+
+
+class OrderBook:
+    """L2 order book for one symbol with microstructure features.
+
+    Snapshots and per-level deltas update preallocated arrays; features are
+    recomputed from the top ``feature_levels`` levels on the first access
+    after an update, so bursts of deltas cost one binary search each.
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        max_levels: int = 100,
+        feature_levels: int = 10,
+        depth_decay: float = 0.5
+    ):
+        self.symbol = symbol
+        self.bids = _BookSide(max_levels, -1.0)
+        self.asks = _BookSide(max_levels, 1.0)
+        self.weights = depth_decay ** np.arange(feature_levels)
+        self.feature_levels = feature_levels
+        self.updates = 0
+        self.timestamp: Optional[float] = None
+        self._features: Optional[BookFeatures] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.bids.count > 0 and self.asks.count > 0
+
+    def apply_snapshot(
+        self,
+        bids: Sequence[Sequence[float]],
+        asks: Sequence[Sequence[float]],
+        timestamp: Optional[float] = None
+    ) -> None:
+        self.bids.load(bids)
+        self.asks.load(asks)
+        self._touch(timestamp)
+
+    def apply_delta(
+        self,
+        bids: Sequence[Sequence[float]] = (),
+        asks: Sequence[Sequence[float]] = (),
+        timestamp: Optional[float] = None
+    ) -> None:
+        """Apply changed levels; a size of zero removes the level."""
+        for level in bids:
+            self.bids.update(level[0], level[1])
+        for level in asks:
+            self.asks.update(level[0], level[1])
+        self._touch(timestamp)
+
+    def _touch(self, timestamp: Optional[float]) -> None:
+        self.updates += 1
+        self.timestamp = timestamp if timestamp is not None else time.time()
+        self._features = None
+
+    @property
+    def features(self) -> Optional[BookFeatures]:
+        if self._features is None and self.ready:
+            self._features = self._compute_features()
+        return self._features
+
+    def _compute_features(self) -> BookFeatures:
+        best_bid = -self.bids.keys[0]
+        best_ask = self.asks.keys[0]
+        bid_size = self.bids.sizes[0]
+        ask_size = self.asks.sizes[0]
+        mid = (best_bid + best_ask) / 2
+        spread = best_ask - best_bid
+
+        levels = self.feature_levels
+        bid_sizes = self.bids.sizes[:min(levels, self.bids.count)]
+        ask_sizes = self.asks.sizes[:min(levels, self.asks.count)]
+        bid_depth = float(np.dot(self.weights[:len(bid_sizes)], bid_sizes))
+        ask_depth = float(np.dot(self.weights[:len(ask_sizes)], ask_sizes))
+
+        return BookFeatures(
+            best_bid=float(best_bid),
+            best_ask=float(best_ask),
+            mid=float(mid),
+            spread=float(spread),
+            spread_bps=float(spread / mid * 10000),
+            microprice=float(
+                (best_bid * ask_size + best_ask * bid_size) / (bid_size + ask_size)
+            ),
+            imbalance=(bid_depth - ask_depth) / (bid_depth + ask_depth),
+            bid_depth=bid_depth,
+            ask_depth=ask_depth
+        )
+
+    def estimate_slippage(self, side: str, quantity: float) -> Optional[SlippageEstimate]:
+        """Average fill price of a market order of ``quantity`` against the book."""
+        features = self.features
+        if features is None or quantity <= 0:
+            return None
+
+        book_side = self.asks if side == 'buy' else self.bids
+        notional, filled = book_side.walk(quantity)
+        if filled == 0:
+            return None
+
+        average_price = notional / filled
+        direction = 1 if side == 'buy' else -1
+        return SlippageEstimate(
+            average_price=float(average_price),
+            slippage_bps=float(
+                direction * (average_price - features.mid) / features.mid * 10000
+            ),
+            filled=filled
+        )
+
+    def available_liquidity(self, side: str, max_slippage_bps: float) -> float:
+        """Largest quantity whose average fill stays within ``max_slippage_bps`` of mid."""
+        features = self.features
+        if features is None:
+            return 0.0
+
+        book_side = self.asks if side == 'buy' else self.bids
+        direction = 1 if side == 'buy' else -1
+        limit = features.mid * (1 + direction * max_slippage_bps / 10000)
+
+        prices = book_side.prices
+        sizes = book_side.sizes[:book_side.count]
+        cumulative_size = np.cumsum(sizes)
+        cumulative_notional = np.cumsum(prices * sizes)
+        # Signed so "within the limit" is <= on both sides.
+        within = direction * (cumulative_notional - limit * cumulative_size) <= 0
+        full = int(np.argmin(within)) if not within.all() else len(within)
+
+        filled = float(cumulative_size[full - 1]) if full else 0.0
+        if full < len(prices):
+            notional = float(cumulative_notional[full - 1]) if full else 0.0
+            price = prices[full]
+            # Solve (notional + price * x) / (filled + x) == limit for x.
+            if price != limit:
+                filled += max(0.0, (limit * filled - notional) / (price - limit))
+        return filled
+
+
+class OrderBookFeed:
+    """Maintains order books for several symbols.
+
+    Books are fed from ccxt ``fetch_order_book`` snapshots (``poll``) or from
+    a recorded JSON-lines file (``replay``) whose lines are either
+    ``{"type": "snapshot", "symbol", "bids", "asks", "timestamp"}`` or
+    ``{"type": "delta", "symbol", "bids", "asks", "timestamp"}``.
+    """
+
+    def __init__(self, config: Dict, exchange=None):
+        self.logger = get_logger(__name__)
+        self.exchange = exchange
+        self.depth = config.get('order_book_depth', 50)
+        self.feature_levels = config.get('order_book_feature_levels', 10)
+        self.symbols = config.get('symbols') or [config.get('symbol', 'BTC/USDT')]
+        self.books: Dict[str, OrderBook] = {
+            symbol: self._new_book(symbol) for symbol in self.symbols
+        }
+
+    def _new_book(self, symbol: str) -> OrderBook:
+        return OrderBook(
+            symbol, max_levels=self.depth, feature_levels=self.feature_levels
+        )
+
+    def book(self, symbol: str) -> OrderBook:
+        if symbol not in self.books:
+            self.books[symbol] = self._new_book(symbol)
+        return self.books[symbol]
+
+    def poll(self) -> Dict[str, BookFeatures]:
+        features = {}
+        for symbol in self.symbols:
+            try:
+                snapshot = self.exchange.fetch_order_book(symbol, limit=self.depth)
+            except Exception as e:
+                self.logger.error(f"Error fetching order book for {symbol}: {e}")
+                continue
+
+            book = self.book(symbol)
+            timestamp = snapshot.get('timestamp')
+            book.apply_snapshot(
+                snapshot['bids'], snapshot['asks'],
+                timestamp / 1000 if timestamp else None
+            )
+            if book.features is not None:
+                features[symbol] = book.features
+        return features
+
+    def replay(self, path: str) -> Iterator[Tuple[str, BookFeatures]]:
+        with open(path) as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                message = json.loads(line)
+                book = self.book(message['symbol'])
+                if message['type'] == 'snapshot':
+                    book.apply_snapshot(
+                        message['bids'], message['asks'], message.get('timestamp')
+                    )
+                else:
+                    book.apply_delta(
+                        message.get('bids', ()), message.get('asks', ()),
+                        message.get('timestamp')
+                    )
+                if book.features is not None:
+                    yield message['symbol'], book.features
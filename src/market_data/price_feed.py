@@ -1,16 +1,17 @@
 import random
 import numpy as np
-from typing import Dict, List
+from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 
 class PriceFeed:
-    def __init__(self, config: Dict):
+    def __init__(self, config: Dict, initialize: bool = True):
         self.base_price = config.get('initial_price', 2000)
         self.volatility = config.get('volatility', 0.002)
         self.trend = config.get('trend', 0)
         self.history_size = config.get('history_size', 100)
         self.price_history = []
-        self._initialize_history()
+        if initialize:
+            self._initialize_history()
 
     def _initialize_history(self) -> None:
         current_price = self.base_price
@@ -33,21 +34,35 @@ class PriceFeed:
 
     def get_latest_price(self) -> float:
         new_price = self._generate_price(self.price_history[-1]['close'])
-        
+        self.push_price(new_price, volume=random.uniform(100, 1000))
+        return new_price
+
+    def push_price(
+        self,
+        price: float,
+        timestamp: Optional[datetime] = None,
+        volume: float = 0.0
+    ) -> None:
+        last_close = self.price_history[-1]['close'] if self.price_history else price
+
         candle = {
-            'timestamp': datetime.now(),
-            'open': self.price_history[-1]['close'],
-            'high': max(new_price, self.price_history[-1]['close']),
-            'low': min(new_price, self.price_history[-1]['close']),
-            'close': new_price,
-            'volume': random.uniform(100, 1000)
+            'timestamp': timestamp or datetime.now(),
+            'open': last_close,
+            'high': max(price, last_close),
+            'low': min(price, last_close),
+            'close': price,
+            'volume': volume
         }
         
         self.price_history.append(candle)
         if len(self.price_history) > self.history_size:
             self.price_history.pop(0)
-            
-        return new_price
 
     def get_historical_data(self) -> List[Dict]:
-        return self.price_history.copy()
\ No newline at end of file
+        return self.price_history.copy()
+
+    def get_state(self) -> Dict:
+        return {'price_history': self.price_history}
+
+    def set_state(self, state: Dict) -> None:
+        self.price_history = list(state['price_history'][-self.history_size:])
@@ -0,0 +1,387 @@
+import glob
+import math
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+import numpy as np
+import pandas as pd
+from ..utils.logger import get_logger
+
+DEFAULT_SYMBOL = 'default'
+
+
+@dataclass
+class FeatureChunk:
+    """A block of training samples.
+
+    ``features`` is ``(n, window, n_features)`` float32, ``labels`` the
+    forward log return over ``horizon`` candles after each window, and
+    ``timestamps`` the close time of each window's last candle.
+    """
+    symbols: np.ndarray
+    timestamps: np.ndarray
+    features: np.ndarray
+    labels: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+
+class CloseWindow(NamedTuple):
+    """The newest closes of one symbol as an array, without per-candle dicts.
+
+    ``end`` counts every close the source has produced, so ``closes[i]`` is
+    close number ``end - len(closes) + i + 1``. Ring buffers can hand over a
+    view of their storage and consumers still know which closes are new.
+    """
+    closes: np.ndarray
+    end: int
+
+
+Candles = Union[Sequence[Dict], CloseWindow]
+
+
+def candle_closes(data: Candles) -> np.ndarray:
+    if isinstance(data, CloseWindow):
+        return data.closes
+    return np.array([candle['close'] for candle in data])
+
+
+class StreamingFeatures:
+    """Indicator features updated one close at a time in O(1).
+
+    Uses the same conventions as the batch indicators: the EMA is seeded with
+    the SMA of its first ``ema_period`` closes, RSI uses Wilder smoothing
+    seeded with simple averages, Bollinger Bands use the population standard
+    deviation and the G-Channel follows ``indicators.custom.GChannel``.
+    ``update`` returns ``None`` until every indicator has warmed up.
+    """
+
+    def __init__(self, config: Dict):
+        self.ema_period = config.get('ema_period', 20)
+        self.rsi_period = config.get('rsi_period', 14)
+        self.bb_period = config.get('bb_period', 20)
+        self.bb_std = config.get('bb_std', 2.0)
+        self.g_channel_length = config.get('g_channel_length', 10)
+        settings = config.get('features') or {}
+        self.return_lags = tuple(settings.get('return_lags', (1, 5, 20)))
+
+        self.names = tuple(f'return_{lag}' for lag in self.return_lags) + (
+            'ema_distance', 'rsi', 'bb_position', 'bb_width',
+            'gchannel_position', 'gchannel_width'
+        )
+        self.warmup = max(
+            self.ema_period, self.rsi_period + 1, self.bb_period,
+            max(self.return_lags) + 1
+        )
+        self.reset()
+
+    @property
+    def n_features(self) -> int:
+        return len(self.names)
+
+    def reset(self) -> None:
+        self.count = 0
+        self.closes = np.zeros(max(self.return_lags) + 1)
+        self.ema: Optional[float] = None
+        self._ema_sum = 0.0
+        self._previous: Optional[float] = None
+        self._gain = self._loss = 0.0
+        self._bb_window = np.zeros(self.bb_period)
+        self._bb_sum = self._bb_squares = 0.0
+        self._upper = self._lower = None
+
+    def update(self, close: float) -> Optional[np.ndarray]:
+        close = float(close)
+        self.count += 1
+        count = self.count
+        self.closes[count % len(self.closes)] = close
+
+        # EMA
+        if count <= self.ema_period:
+            self._ema_sum += close
+            if count == self.ema_period:
+                self.ema = self._ema_sum / self.ema_period
+        else:
+            alpha = 2 / (self.ema_period + 1)
+            self.ema += alpha * (close - self.ema)
+
+        # RSI (Wilder)
+        if self._previous is not None:
+            change = close - self._previous
+            gain, loss = max(change, 0.0), max(-change, 0.0)
+            if count <= self.rsi_period + 1:
+                self._gain += gain / self.rsi_period
+                self._loss += loss / self.rsi_period
+            else:
+                self._gain += (gain - self._gain) / self.rsi_period
+                self._loss += (loss - self._loss) / self.rsi_period
+        self._previous = close
+
+        # Bollinger: running sums, recomputed exactly on every wrap.
+        slot = (count - 1) % self.bb_period
+        old = self._bb_window[slot]
+        self._bb_window[slot] = close
+        if slot == self.bb_period - 1:
+            self._bb_sum = float(self._bb_window.sum())
+            self._bb_squares = float(np.dot(self._bb_window, self._bb_window))
+        else:
+            self._bb_sum += close - old
+            self._bb_squares += close * close - old * old
+
+        # G-Channel
+        if self._upper is None:
+            self._upper = self._lower = close
+        else:
+            width = (self._upper - self._lower) / self.g_channel_length
+            self._upper, self._lower = (
+                max(close, self._upper) - width,
+                min(close, self._lower) + width
+            )
+
+        if count < self.warmup:
+            return None
+        return self._features(close)
+
+    def _features(self, close: float) -> np.ndarray:
+        size = len(self.closes)
+        returns = [
+            math.log(close / self.closes[(self.count - lag) % size])
+            for lag in self.return_lags
+        ]
+
+        rsi = 1.0 if self._loss == 0 else 1 - 1 / (1 + self._gain / self._loss)
+
+        middle = self._bb_sum / self.bb_period
+        variance = max(self._bb_squares / self.bb_period - middle * middle, 0.0)
+        band = self.bb_std * math.sqrt(variance)
+
+        channel = self._upper - self._lower
+        average = (self._upper + self._lower) / 2
+
+        return np.array(returns + [
+            close / self.ema - 1,
+            rsi,
+            (close - middle) / band if band else 0.0,
+            2 * band / middle,
+            (close - average) / channel if channel else 0.0,
+            channel / average
+        ], dtype=np.float32)
+
+
+class FeatureWindow:
+    """Fixed-width window of the most recent feature rows for one symbol.
+
+    Rows are written twice into a buffer of ``2 * capacity`` so the last
+    ``capacity`` rows are always one contiguous slice; memory is constant no
+    matter how many candles pass through.
+    """
+
+    def __init__(self, config: Dict, window: int, horizon: int = 0):
+        self.features = StreamingFeatures(config)
+        self.window = window
+        self.horizon = horizon
+        self.capacity = window + horizon
+        self._rows = np.zeros((2 * self.capacity, self.features.n_features), np.float32)
+        self._closes = np.zeros(2 * self.capacity)
+        self._timestamps = np.empty(2 * self.capacity, dtype=object)
+        self.rows = 0
+        self.last_timestamp = None
+
+    def reset(self) -> None:
+        self.features.reset()
+        self.rows = 0
+        self.last_timestamp = None
+
+    def push(self, close: float, timestamp=None) -> bool:
+        """Add one candle; return True when a new feature row was produced."""
+        self.last_timestamp = timestamp
+        row = self.features.update(close)
+        if row is None:
+            return False
+
+        position = self.rows % self.capacity
+        for index in (position, position + self.capacity):
+            self._rows[index] = row
+            self._closes[index] = close
+            self._timestamps[index] = timestamp
+        self.rows += 1
+        return True
+
+    def _span(self, length: int) -> slice:
+        end = self.rows % self.capacity + self.capacity
+        return slice(end - length, end)
+
+    def latest(self) -> Optional[np.ndarray]:
+        """The newest ``window`` rows, or None while warming up. Not a copy."""
+        if self.rows < self.window:
+            return None
+        return self._rows[self._span(self.window)]
+
+    def labelled(self) -> Optional[Tuple[np.ndarray, float, object]]:
+        """The window that ended ``horizon`` rows ago with its forward return."""
+        if self.horizon <= 0 or self.rows < self.capacity:
+            return None
+        span = self._span(self.capacity)
+        closes = self._closes[span]
+        end = span.start + self.window
+        label = math.log(closes[-1] / closes[self.window - 1])
+        return self._rows[span.start:end], label, self._timestamps[end - 1]
+
+
+class FeaturePipeline:
+    """Turns a stream of candles into chunks of labelled feature windows.
+
+    Candles are dicts with ``close`` and optionally ``timestamp`` and
+    ``symbol``; each symbol keeps its own indicator state. Only one window
+    per symbol and the chunk being filled are held in memory, so any amount
+    of history can be processed and written out with ``write_chunks`` for
+    out-of-core training.
+    """
+
+    def __init__(self, config: Dict):
+        self.logger = get_logger(__name__)
+        self.config = config
+        settings = config.get('features') or {}
+        self.window = settings.get('window', 32)
+        self.horizon = settings.get('horizon', 5)
+        self.chunk_size = settings.get('chunk_size', 4096)
+        self.windows: Dict[str, FeatureWindow] = {}
+        self.names = StreamingFeatures(config).names
+
+    def _window(self, symbol: str) -> FeatureWindow:
+        if symbol not in self.windows:
+            self.windows[symbol] = FeatureWindow(self.config, self.window, self.horizon)
+        return self.windows[symbol]
+
+    def stream(self, candles: Iterable[Dict]) -> Iterator[FeatureChunk]:
+        shape = (self.chunk_size, self.window, len(self.names))
+        features = np.empty(shape, dtype=np.float32)
+        labels = np.empty(self.chunk_size, dtype=np.float32)
+        symbols: List[str] = []
+        timestamps: List = []
+
+        for candle in candles:
+            symbol = candle.get('symbol', DEFAULT_SYMBOL)
+            window = self._window(symbol)
+            if not window.push(candle['close'], candle.get('timestamp')):
+                continue
+            sample = window.labelled()
+            if sample is None:
+                continue
+
+            index = len(symbols)
+            features[index], labels[index], timestamp = sample
+            symbols.append(symbol)
+            timestamps.append(timestamp)
+
+            if len(symbols) == self.chunk_size:
+                yield FeatureChunk(
+                    np.array(symbols), np.array(timestamps), features, labels
+                )
+                features = np.empty(shape, dtype=np.float32)
+                labels = np.empty(self.chunk_size, dtype=np.float32)
+                symbols, timestamps = [], []
+
+        if symbols:
+            count = len(symbols)
+            yield FeatureChunk(
+                np.array(symbols), np.array(timestamps),
+                features[:count], labels[:count]
+            )
+
+    def write_chunks(self, candles: Iterable[Dict], output_dir: str) -> int:
+        """Write each chunk as ``features-NNNNN.npy``/``labels-NNNNN.npy``."""
+        os.makedirs(output_dir, exist_ok=True)
+        samples = 0
+        for number, chunk in enumerate(self.stream(candles)):
+            np.save(os.path.join(output_dir, f'features-{number:05d}.npy'), chunk.features)
+            np.save(os.path.join(output_dir, f'labels-{number:05d}.npy'), chunk.labels)
+            samples += len(chunk)
+        self.logger.info(f"Wrote {samples} feature windows to {output_dir}")
+        return samples
+
+
+def load_chunks(directory: str) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    """Memory-map the chunks written by ``FeaturePipeline.write_chunks``."""
+    for path in sorted(glob.glob(os.path.join(directory, 'features-*.npy'))):
+        labels_path = path.replace('features-', 'labels-')
+        yield np.load(path, mmap_mode='r'), np.load(labels_path, mmap_mode='r')
+
+
+def iter_csv_candles(
+    path: str,
+    chunksize: int = 100_000,
+    symbol: Optional[str] = None
+) -> Iterator[Dict]:
+    """Read candles from a CSV with at least a ``close`` column, chunk by chunk."""
+    for frame in pd.read_csv(path, chunksize=chunksize):
+        if symbol is not None:
+            frame['symbol'] = symbol
+        yield from frame.to_dict('records')
+
+
+def iter_price_feed(price_feed, ticks: int = 0) -> Iterator[Dict]:
+    """Yield a ``PriceFeed``'s history, then ``ticks`` freshly generated candles."""
+    yield from price_feed.get_historical_data()
+    for _ in range(ticks):
+        price_feed.get_latest_price()
+        yield price_feed.price_history[-1]
+
+
+def feature_windows(
+    windows: Dict[str, FeatureWindow],
+    data_by_symbol: Dict[str, Candles],
+    config: Dict,
+    window: int
+) -> Dict[str, np.ndarray]:
+    """Bring each symbol's window up to date with its candles; return the ready ones.
+
+    Only candles newer than the last one applied are pushed, found by
+    timestamp or by ``CloseWindow.end``, so a rolling history costs one
+    update per new candle. Without either, or after a gap, the window is
+    rebuilt from the candles given.
+    """
+    ready = {}
+    for symbol, data in data_by_symbol.items():
+        state = windows.get(symbol)
+        if state is None:
+            state = windows[symbol] = FeatureWindow(config, window)
+
+        if isinstance(data, CloseWindow):
+            _apply_closes(state, data)
+        elif data:
+            _apply_candles(state, data)
+
+        latest = state.latest()
+        if latest is not None:
+            ready[symbol] = latest
+    return ready
+
+
+def _apply_candles(state: FeatureWindow, data: Sequence[Dict]) -> None:
+    last = state.last_timestamp
+    first = data[0].get('timestamp')
+    if last is None or first is None or first > last:
+        state.reset()
+        start = 0
+    else:
+        start = len(data)
+        while start and data[start - 1]['timestamp'] > last:
+            start -= 1
+
+    for candle in data[start:]:
+        state.push(candle['close'], candle.get('timestamp'))
+
+
+def _apply_closes(state: FeatureWindow, data: CloseWindow) -> None:
+    closes, end = data.closes, int(data.end)
+    first = end - len(closes) + 1
+    last = state.last_timestamp
+    # Close numbers stand in for timestamps; anything else means a fresh start.
+    if not isinstance(last, int) or not first - 1 <= last <= end:
+        state.reset()
+        last = first - 1
+
+    for number, close in enumerate(closes[last - first + 1:].tolist(), last + 1):
+        state.push(close, number)
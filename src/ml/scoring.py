@@ -0,0 +1,56 @@
+import os
+import pickle
+from typing import Any, Dict, Sequence
+import numpy as np
+from .feature_pipeline import FeatureWindow, feature_windows
+
+
+def load_model(path: str) -> Any:
+    """Load a Keras model (``.keras``/``.h5``) or a pickled scikit-learn model."""
+    if os.path.splitext(path)[1] in ('.keras', '.h5'):
+        from tensorflow import keras
+        return keras.models.load_model(path)
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+class ModelScorer:
+    """Scores the latest feature window of many symbols with one model.
+
+    Windows that are ready are stacked and sent through the model in
+    micro-batches of ``batch_size``, so N symbols cost ``ceil(N /
+    batch_size)`` model calls instead of N. The model predicts the forward
+    return the training labels describe. Scikit-learn style models get
+    windows flattened to ``(n, window * n_features)``; set
+    ``model_input: sequence`` to pass ``(n, window, n_features)`` instead.
+    """
+
+    def __init__(self, model: Any, config: Dict):
+        self.model = model
+        self.config = config
+        settings = config.get('features') or {}
+        self.window = settings.get('window', 32)
+        self.batch_size = settings.get('batch_size', 256)
+        self.flatten = settings.get('model_input', 'flat') == 'flat'
+        # Keras' predict_on_batch skips the per-call dataset setup of predict.
+        self._predict = getattr(model, 'predict_on_batch', None) or model.predict
+        self.windows: Dict[str, FeatureWindow] = {}
+
+    def score(self, data_by_symbol: Dict[str, Sequence[Dict]]) -> Dict[str, float]:
+        ready = feature_windows(self.windows, data_by_symbol, self.config, self.window)
+        if not ready:
+            return {}
+
+        symbols = list(ready)
+        windows = np.stack([ready[symbol] for symbol in symbols])
+        return dict(zip(symbols, self.predict(windows).tolist()))
+
+    def predict(self, windows: np.ndarray) -> np.ndarray:
+        scores = np.empty(len(windows), dtype=np.float64)
+        for start in range(0, len(windows), self.batch_size):
+            batch = windows[start:start + self.batch_size]
+            if self.flatten:
+                batch = batch.reshape(len(batch), -1)
+            output = np.asarray(self._predict(batch))
+            scores[start:start + len(batch)] = output.reshape(len(batch), -1)[:, 0]
+        return scores
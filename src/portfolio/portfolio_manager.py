@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from datetime import datetime
 from typing import Dict, Optional
 from ..utils.logger import get_logger
 
@@ -20,6 +21,7 @@ class PortfolioManager:
         self.total_pnl = 0
         self.peak_value = initial_balance
         self.max_drawdown = 0
+        self.last_price: Optional[float] = None
 
     @property
     def has_position(self) -> bool:
@@ -29,6 +31,11 @@ class PortfolioManager:
         if self.has_position:
             self.logger.warning("Attempted to buy while position exists")
             return
+
+        # Also rejects a NaN size from a risk score computed before warm-up.
+        if not size > 0:
+            self.logger.warning(f"Rejected buy of non-positive size {size}")
+            return
             
         cost = price * size
         if cost > self.balance:
@@ -72,7 +79,11 @@ class PortfolioManager:
             f"Closed position: PnL ${pnl:.2f} ({pnl_percentage:+.2f}%)"
         )
 
+    def get_balance(self) -> float:
+        return self.balance
+
     def update_value(self, current_price: float) -> None:
+        self.last_price = current_price
         total_value = self.get_total_value(current_price)
         
         if total_value > self.peak_value:
@@ -89,7 +100,9 @@ class PortfolioManager:
         )
         return self.balance + position_value
 
-    def get_status(self) -> Dict:
+    def get_status(self, current_price: Optional[float] = None) -> Dict:
+        if current_price is None:
+            current_price = self.last_price or 0
         current_value = self.get_total_value(current_price)
         
         return {
@@ -106,4 +119,13 @@ class PortfolioManager:
                 else 0
             ),
             'max_drawdown': self.max_drawdown
-        }
\ No newline at end of file
+        }
+
+    def get_state(self) -> Dict:
+        state = vars(self).copy()
+        del state['logger']
+        return state
+
+    def set_state(self, state: Dict) -> None:
+        for key, value in state.items():
+            setattr(self, key, value)
@@ -0,0 +1,2 @@
+from .position_sizer import PositionSizer
+from .trigger_book import TriggerBook, TriggerFill
@@ -5,6 +5,7 @@ class PositionSizer:
         self.risk_percentage = config.get('risk_percentage', 1.0)
         self.stop_loss_percentage = config.get('stop_loss_percentage', 2.0)
         self.take_profit_percentage = config.get('take_profit_percentage', 5.0)
+        self.max_slippage_bps = config.get('max_slippage_bps', 10.0)
 
     def calculate_position_size(self, balance: float, entry_price: float, risk_score: float) -> float:
         """
@@ -27,3 +28,12 @@ class PositionSizer:
         """
         take_profit_price = entry_price * (1 + self.take_profit_percentage / 100)
         return take_profit_price
+
+    def limit_to_liquidity(self, position_size: float, order_book, side: str = 'buy') -> float:
+        """
+        Cap the position size to what the order book can fill within the maximum slippage.
+        """
+        if order_book is None or order_book.features is None:
+            return position_size
+        available = order_book.available_liquidity(side, self.max_slippage_bps)
+        return min(position_size, available)
@@ -0,0 +1,280 @@
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+# Both sides are stored in "long space": short levels are negated, so every
+# stop fires when x <= level and every target fires when x >= level, where x is
+# the price (long) or minus the price (short).
+_SIDE_SIGN = {'long': 1.0, 'short': -1.0}
+
+
+@dataclass
+class TriggerFill:
+    position_id: int
+    symbol: str
+    side: str
+    kind: str
+    level: float
+    price: float
+
+
+@dataclass
+class _Exit:
+    position_id: int
+    symbol: str
+    side: str
+    stop_loss: Optional[float] = None
+    take_profit: Optional[float] = None
+    trailing_percentage: Optional[float] = None
+    bucket: Optional['_TrailBucket'] = None
+
+
+class _TrailBucket:
+    __slots__ = ('mark', 'members')
+
+    def __init__(self, mark: float):
+        self.mark = mark
+        self.members = set()
+
+
+class _TrailingGroup:
+    """Trailing stops for one symbol, side and trail percentage.
+
+    Positions are bucketed by high-water mark (in long space). A new price
+    lifts every bucket below it to the price, which merges a prefix of the
+    sorted marks into one bucket, and fires the suffix of buckets whose stop
+    ``mark * factor`` the price has crossed. Both are O(log n + k).
+    """
+
+    def __init__(self, factor: float):
+        self.factor = factor
+        self.marks: List[float] = []
+        self.buckets: Dict[float, _TrailBucket] = {}
+
+    def add(self, exit_: _Exit, x: float) -> None:
+        bucket = self.buckets.get(x)
+        if bucket is None:
+            bucket = _TrailBucket(x)
+            self.buckets[x] = bucket
+            insort(self.marks, x)
+        bucket.members.add(exit_.position_id)
+        exit_.bucket = bucket
+
+    def remove(self, exit_: _Exit) -> None:
+        bucket = exit_.bucket
+        exit_.bucket = None
+        if bucket is None:
+            return
+        bucket.members.discard(exit_.position_id)
+        if not bucket.members:
+            del self.buckets[bucket.mark]
+            del self.marks[bisect_left(self.marks, bucket.mark)]
+
+    def advance(self, x: float, exits: Dict[int, _Exit]) -> List[_TrailBucket]:
+        # Fire first: a bucket's stop is based on its mark before this tick.
+        cut = bisect_left(self.marks, x / self.factor)
+        fired = [self.buckets.pop(mark) for mark in self.marks[cut:]]
+        del self.marks[cut:]
+
+        lifted = bisect_left(self.marks, x)
+        if lifted:
+            merged = self.buckets.pop(self.marks[lifted - 1])
+            for mark in self.marks[:lifted - 1]:
+                bucket = self.buckets.pop(mark)
+                for position_id in bucket.members:
+                    exits[position_id].bucket = merged
+                merged.members |= bucket.members
+            del self.marks[:lifted]
+
+            existing = self.buckets.get(x)
+            if existing is not None:
+                for position_id in merged.members:
+                    exits[position_id].bucket = existing
+                existing.members |= merged.members
+            else:
+                merged.mark = x
+                self.buckets[x] = merged
+                self.marks.insert(0, x)
+
+        return fired
+
+
+class _SymbolBook:
+    def __init__(self):
+        self.stops: List[Tuple[float, int]] = []
+        self.targets: List[Tuple[float, int]] = []
+        self.trailing: Dict[float, _TrailingGroup] = {}
+
+
+class TriggerBook:
+    """Sorted stop-loss / take-profit / trailing-stop levels per symbol and side.
+
+    ``on_price`` only touches the triggers the new price crossed, so enforcing
+    exits on every tick costs O(log n + k) instead of a scan over all open
+    positions. When one exit of a position fires, its other exits are
+    cancelled.
+    """
+
+    def __init__(self):
+        self._books: Dict[Tuple[str, str], _SymbolBook] = {}
+        self._exits: Dict[int, _Exit] = {}
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._exits)
+
+    def __contains__(self, position_id: int) -> bool:
+        return position_id in self._exits
+
+    def add_position(
+        self,
+        symbol: str,
+        side: str,
+        entry_price: float,
+        stop_loss: Optional[float] = None,
+        take_profit: Optional[float] = None,
+        trailing_percentage: Optional[float] = None,
+        position_id: Optional[int] = None
+    ) -> int:
+        if side not in _SIDE_SIGN:
+            raise ValueError(f"Unknown position side: {side}")
+
+        if position_id is None:
+            position_id = self._next_id
+        if position_id in self._exits:
+            raise ValueError(f"Position {position_id} already has triggers")
+        self._next_id = max(self._next_id, position_id + 1)
+
+        sign = _SIDE_SIGN[side]
+        book = self._books.setdefault((symbol, side), _SymbolBook())
+        exit_ = _Exit(position_id, symbol, side, stop_loss, take_profit)
+        self._exits[position_id] = exit_
+
+        if stop_loss is not None:
+            insort(book.stops, (sign * stop_loss, position_id))
+        if take_profit is not None:
+            insort(book.targets, (sign * take_profit, position_id))
+        if trailing_percentage:
+            exit_.trailing_percentage = trailing_percentage
+            self._trailing_group(book, side, trailing_percentage).add(
+                exit_, sign * entry_price
+            )
+
+        return position_id
+
+    def cancel(self, position_id: int) -> None:
+        exit_ = self._exits.pop(position_id, None)
+        if exit_ is None:
+            return
+
+        sign = _SIDE_SIGN[exit_.side]
+        book = self._books[(exit_.symbol, exit_.side)]
+        if exit_.stop_loss is not None:
+            _remove(book.stops, (sign * exit_.stop_loss, position_id))
+        if exit_.take_profit is not None:
+            _remove(book.targets, (sign * exit_.take_profit, position_id))
+        if exit_.trailing_percentage:
+            book.trailing[exit_.trailing_percentage].remove(exit_)
+
+    def on_price(self, symbol: str, price: float) -> List[TriggerFill]:
+        fills: List[TriggerFill] = []
+        for side, sign in _SIDE_SIGN.items():
+            book = self._books.get((symbol, side))
+            if book is not None:
+                self._check_book(book, sign, price, fills)
+        return fills
+
+    def get_levels(self, position_id: int) -> Dict[str, Optional[float]]:
+        exit_ = self._exits[position_id]
+        trailing_stop = None
+        if exit_.bucket is not None:
+            sign = _SIDE_SIGN[exit_.side]
+            group = self._books[(exit_.symbol, exit_.side)].trailing[
+                exit_.trailing_percentage
+            ]
+            trailing_stop = sign * exit_.bucket.mark * group.factor
+
+        return {
+            'stop_loss': exit_.stop_loss,
+            'take_profit': exit_.take_profit,
+            'trailing_stop': trailing_stop
+        }
+
+    def _trailing_group(
+        self,
+        book: _SymbolBook,
+        side: str,
+        trailing_percentage: float
+    ) -> _TrailingGroup:
+        group = book.trailing.get(trailing_percentage)
+        if group is None:
+            # Long stops trail below the high, short stops above the low.
+            offset = trailing_percentage / 100
+            factor = 1 - offset if side == 'long' else 1 + offset
+            group = _TrailingGroup(factor)
+            book.trailing[trailing_percentage] = group
+        return group
+
+    def _check_book(
+        self,
+        book: _SymbolBook,
+        sign: float,
+        price: float,
+        fills: List[TriggerFill]
+    ) -> None:
+        x = sign * price
+        cut = bisect_left(book.stops, (x, -1))
+        crossed = book.stops[cut:]
+        del book.stops[cut:]
+        for level, position_id in crossed:
+            self._fire(position_id, 'stop_loss', price, fills)
+
+        cut = bisect_right(book.targets, (x, float('inf')))
+        crossed = book.targets[:cut]
+        del book.targets[:cut]
+        for level, position_id in crossed:
+            self._fire(position_id, 'take_profit', price, fills)
+
+        for group in book.trailing.values():
+            for bucket in group.advance(x, self._exits):
+                level = sign * bucket.mark * group.factor
+                for position_id in bucket.members:
+                    exit_ = self._exits.get(position_id)
+                    if exit_ is not None:
+                        exit_.bucket = None
+                        self._fire(position_id, 'trailing_stop', price, fills, level)
+
+    def _fire(
+        self,
+        position_id: int,
+        kind: str,
+        price: float,
+        fills: List[TriggerFill],
+        level: Optional[float] = None
+    ) -> None:
+        exit_ = self._exits.get(position_id)
+        if exit_ is None:
+            return
+
+        # The crossed level is already popped from its list; clear it so
+        # cancel only removes the position's remaining triggers.
+        if kind == 'stop_loss':
+            level, exit_.stop_loss = exit_.stop_loss, None
+        elif kind == 'take_profit':
+            level, exit_.take_profit = exit_.take_profit, None
+        self.cancel(position_id)
+
+        fills.append(TriggerFill(
+            position_id=position_id,
+            symbol=exit_.symbol,
+            side=exit_.side,
+            kind=kind,
+            level=level,
+            price=price
+        ))
+
+
+def _remove(levels: List[Tuple[float, int]], entry: Tuple[float, int]) -> None:
+    index = bisect_left(levels, entry)
+    if index < len(levels) and levels[index] == entry:
+        del levels[index]
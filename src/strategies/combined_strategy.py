@@ -1,10 +1,26 @@
-from dataclasses import dataclass
-from typing import List, Dict
-import numpy as np
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional
 from ..indicators.trend import EMAIndicator
 from ..indicators.momentum import RSIIndicator
 from ..indicators.volatility import BollingerBands
 from ..indicators.custom import GChannel
+from ..indicators.backend import get_backend
+from ..market_data.order_book import BookFeatures
+from ..ml.feature_pipeline import DEFAULT_SYMBOL, Candles, candle_closes
+from ..ml.scoring import ModelScorer, load_model
+
+# Everything CombinedStrategy and its model scorer read from the config; saved
+# strategy state is only valid while these are unchanged.
+STRATEGY_CONFIG_KEYS = (
+    'indicator_backend', 'ema_period', 'rsi_period', 'bb_period', 'bb_std',
+    'g_channel_length', 'rsi_oversold', 'rsi_overbought', 'min_confidence',
+    'max_spread_bps', 'model_path', 'min_model_return', 'features'
+)
+
+
+def strategy_config(config: Dict) -> Dict:
+    return {key: config.get(key) for key in STRATEGY_CONFIG_KEYS}
+
 
 @dataclass
 class SignalResult:
@@ -12,20 +28,81 @@ class SignalResult:
     should_trade: bool
     risk_score: float
     confidence: float
+    model_score: Optional[float] = None
 
 class CombinedStrategy:
     def __init__(self, config: Dict):
-        self.ema = EMAIndicator(config.get('ema_period', 20))
-        self.rsi = RSIIndicator(config.get('rsi_period', 14))
-        self.bbands = BollingerBands(config.get('bb_period', 20))
-        self.gchannel = GChannel(config.get('g_channel_length', 10))
+        backend = get_backend(config.get('indicator_backend'))
+        self.ema = EMAIndicator(config.get('ema_period', 20), backend)
+        self.rsi = RSIIndicator(config.get('rsi_period', 14), backend)
+        self.bbands = BollingerBands(
+            config.get('bb_period', 20), config.get('bb_std', 2.0), backend
+        )
+        self.gchannel = GChannel(config.get('g_channel_length', 10), backend)
         
         self.rsi_oversold = config.get('rsi_oversold', 30)
         self.rsi_overbought = config.get('rsi_overbought', 70)
         self.min_confidence = config.get('min_confidence', 0.7)
+        self.max_spread_bps = config.get('max_spread_bps', 50.0)
+
+        self.config = config
+        self.min_model_return = config.get('min_model_return', 0.0)
+        self.scorer: Optional[ModelScorer] = None
+        if config.get('model_path'):
+            self.set_model(load_model(config['model_path']))
 
-    def generate_signals(self, data: List[Dict]) -> SignalResult:
-        prices = np.array([candle['close'] for candle in data])
+    def set_model(self, model: Any) -> None:
+        self.scorer = ModelScorer(model, self.config) if model is not None else None
+
+    def generate_signals(
+        self,
+        data: Candles,
+        book_features: Optional[BookFeatures] = None
+    ) -> SignalResult:
+        return self.generate_signals_batch(
+            {DEFAULT_SYMBOL: data},
+            {DEFAULT_SYMBOL: book_features}
+        )[DEFAULT_SYMBOL]
+
+    def generate_signals_batch(
+        self,
+        data_by_symbol: Dict[str, Candles],
+        book_features: Optional[Dict[str, BookFeatures]] = None
+    ) -> Dict[str, SignalResult]:
+        """Signals for several symbols with one batched model call.
+
+        Each symbol's data is a list of candles or a ``CloseWindow``. With
+        a model attached, a trade also needs the predicted forward return to
+        agree with the action by more than ``min_model_return``.
+        """
+        book_features = book_features or {}
+        results = {
+            symbol: self._rule_signals(data, book_features.get(symbol))
+            for symbol, data in data_by_symbol.items()
+        }
+        if self.scorer is None:
+            return results
+
+        scores = self.scorer.score(data_by_symbol)
+        for symbol, signals in results.items():
+            score = scores.get(symbol)
+            direction = 1 if signals.action == 'buy' else -1 if signals.action == 'sell' else 0
+            results[symbol] = replace(
+                signals,
+                should_trade=(
+                    signals.should_trade and score is not None
+                    and direction * score > self.min_model_return
+                ),
+                model_score=score
+            )
+        return results
+
+    def _rule_signals(
+        self,
+        data: Candles,
+        book_features: Optional[BookFeatures] = None
+    ) -> SignalResult:
+        prices = candle_closes(data)
         
         ema_signal = self.ema.calculate(prices)
         rsi_value = self.rsi.calculate(prices)
@@ -68,6 +145,12 @@ class CombinedStrategy:
             bb_signal,
             prices[-1]
         )
+
+        if book_features is not None:
+            # Don't cross a wide spread, and trust trades the book leans toward.
+            should_trade = should_trade and book_features.spread_bps <= self.max_spread_bps
+            direction = 1 if action == 'buy' else -1 if action == 'sell' else 0
+            risk_score = min(1.0, risk_score * (1 + direction * book_features.imbalance))
         
         return SignalResult(
             action=action,
@@ -84,9 +167,15 @@ class CombinedStrategy:
         current_price: float
     ) -> float:
         # Risk score between 0 (highest risk) and 1 (lowest risk)
-        volatility_risk = abs(current_price - bb_signal.middle[-1]) / (
-            bb_signal.upper[-1] - bb_signal.middle[-1]
+        # Distance from the middle band in half-band widths. Trades only fire
+        # outside the bands (distance >= 1), so map it onto [0, 1) instead of
+        # using it directly, which would make every traded score negative.
+        half_width = bb_signal.upper[-1] - bb_signal.middle[-1]
+        distance = (
+            abs(current_price - bb_signal.middle[-1]) / half_width
+            if half_width > 0 else 0.0
         )
+        volatility_risk = distance / (1 + distance)
         
         rsi_risk = abs(50 - rsi) / 50
         
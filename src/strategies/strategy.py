@@ -6,6 +6,7 @@ from ..indicators.trend import EMAIndicator
 from ..indicators.momentum import RSIIndicator
 from ..indicators.volatility import BollingerBands
 from ..indicators.custom import GChannel
+from ..indicators.backend import get_backend
 
 @dataclass
 class SignalResult:
@@ -16,10 +17,13 @@ class SignalResult:
 
 class AdvancedStrategy:
     def __init__(self, config: Dict):
-        self.ema = EMAIndicator(config.get('ema_period', 20))
-        self.rsi = RSIIndicator(config.get('rsi_period', 14))
-        self.bbands = BollingerBands(config.get('bb_period', 20))
-        self.gchannel = GChannel(config.get('g_channel_length', 10))
+        backend = get_backend(config.get('indicator_backend'))
+        self.ema = EMAIndicator(config.get('ema_period', 20), backend)
+        self.rsi = RSIIndicator(config.get('rsi_period', 14), backend)
+        self.bbands = BollingerBands(
+            config.get('bb_period', 20), config.get('bb_std', 2.0), backend
+        )
+        self.gchannel = GChannel(config.get('g_channel_length', 10), backend)
         
         self.rsi_oversold = config.get('rsi_oversold', 30)
         self.rsi_overbought = config.get('rsi_overbought', 70)
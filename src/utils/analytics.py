@@ -0,0 +1,202 @@
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+import numpy as np
+import pandas as pd
+
+SUMMARY_METRICS = (
+    'total_return', 'annual_return', 'annual_volatility', 'sharpe', 'sortino',
+    'max_drawdown', 'calmar', 'trades', 'win_rate', 'avg_trade_return',
+    'profit_factor', 'exposure'
+)
+
+
+@dataclass
+class Tearsheet:
+    """Performance statistics for a batch of backtests.
+
+    Scalar metrics are arrays with one entry per backtest; ``drawdown``,
+    ``rolling_return`` and ``rolling_volatility`` are ``(n_backtests,
+    n_periods)`` series. Returns and drawdowns are fractions, not percentages.
+    """
+    names: List[str]
+    total_return: np.ndarray
+    annual_return: np.ndarray
+    annual_volatility: np.ndarray
+    sharpe: np.ndarray
+    sortino: np.ndarray
+    max_drawdown: np.ndarray
+    calmar: np.ndarray
+    trades: np.ndarray
+    win_rate: np.ndarray
+    avg_trade_return: np.ndarray
+    profit_factor: np.ndarray
+    exposure: np.ndarray
+    drawdown: np.ndarray
+    rolling_return: np.ndarray
+    rolling_volatility: np.ndarray
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {metric: getattr(self, metric) for metric in SUMMARY_METRICS},
+            index=pd.Index(self.names, name='backtest')
+        )
+
+    def rank(
+        self,
+        metric: str = 'sharpe',
+        ascending: bool = False,
+        top: Optional[int] = None
+    ) -> pd.DataFrame:
+        ranked = self.to_frame().sort_values(
+            metric, ascending=ascending, na_position='last'
+        )
+        return ranked.head(top) if top else ranked
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+def compute_tearsheet(
+    equity: np.ndarray,
+    positions: Optional[np.ndarray] = None,
+    periods_per_year: int = 252,
+    window: int = 20,
+    risk_free_rate: float = 0.0,
+    names: Optional[Sequence[str]] = None
+) -> Tearsheet:
+    """Compute a full tearsheet for many equity curves in one pass.
+
+    ``equity`` is ``(n_backtests, n_periods)``, one row per backtest (a single
+    curve may be passed as 1-D). ``positions`` has the same shape and is
+    non-zero while a backtest holds a position; trade statistics and exposure
+    are NaN without it. Every statistic is computed with whole-matrix NumPy
+    operations, so the cost is linear in the total number of points.
+    """
+    equity = np.atleast_2d(np.asarray(equity, dtype=np.float64))
+    n_backtests, n_periods = equity.shape
+    if n_periods < 2:
+        raise ValueError("Equity curves need at least two periods")
+    names = list(names) if names is not None else [str(i) for i in range(n_backtests)]
+
+    returns = equity[:, 1:] / equity[:, :-1] - 1
+    log_returns = np.log1p(returns)
+    excess = returns - risk_free_rate / periods_per_year
+    annualize = np.sqrt(periods_per_year)
+
+    total_return = equity[:, -1] / equity[:, 0] - 1
+    annual_return = (1 + total_return) ** (periods_per_year / returns.shape[1]) - 1
+    volatility = returns.std(axis=1, ddof=1)
+    downside = np.sqrt(np.mean(np.minimum(excess, 0) ** 2, axis=1))
+
+    peak = np.maximum.accumulate(equity, axis=1)
+    drawdown = equity / peak - 1
+    max_drawdown = -drawdown.min(axis=1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = excess.mean(axis=1) / volatility * annualize
+        sortino = excess.mean(axis=1) / downside * annualize
+        calmar = annual_return / max_drawdown
+
+    rolling_return, rolling_volatility = _rolling_stats(
+        log_returns, window, annualize
+    )
+
+    trade_stats = _trade_stats(log_returns, positions, equity.shape)
+
+    return Tearsheet(
+        names=names,
+        total_return=total_return,
+        annual_return=annual_return,
+        annual_volatility=volatility * annualize,
+        sharpe=sharpe,
+        sortino=sortino,
+        max_drawdown=max_drawdown,
+        calmar=calmar,
+        drawdown=drawdown,
+        rolling_return=rolling_return,
+        rolling_volatility=rolling_volatility,
+        **trade_stats
+    )
+
+
+def _rolling_stats(log_returns: np.ndarray, window: int, annualize: float):
+    """Rolling compounded return and annualized volatility via prefix sums.
+
+    Both are aligned with the equity curve: column ``t`` covers the ``window``
+    returns ending at period ``t`` and is NaN until that many exist.
+    """
+    n_backtests, n_returns = log_returns.shape
+    rolling_return = np.full((n_backtests, n_returns + 1), np.nan)
+    rolling_volatility = np.full((n_backtests, n_returns + 1), np.nan)
+    if window < 2 or window > n_returns:
+        return rolling_return, rolling_volatility
+
+    zeros = np.zeros((n_backtests, 1))
+    sums = np.concatenate((zeros, np.cumsum(log_returns, axis=1)), axis=1)
+    squares = np.concatenate((zeros, np.cumsum(log_returns ** 2, axis=1)), axis=1)
+    window_sum = sums[:, window:] - sums[:, :-window]
+    window_squares = squares[:, window:] - squares[:, :-window]
+
+    variance = (window_squares - window_sum ** 2 / window) / (window - 1)
+    rolling_return[:, window:] = np.expm1(window_sum)
+    rolling_volatility[:, window:] = np.sqrt(np.maximum(variance, 0)) * annualize
+    return rolling_return, rolling_volatility
+
+
+def _trade_stats(log_returns: np.ndarray, positions: Optional[np.ndarray], shape):
+    n_backtests = shape[0]
+    if positions is None:
+        missing = np.full(n_backtests, np.nan)
+        return {
+            'trades': missing, 'win_rate': missing, 'avg_trade_return': missing,
+            'profit_factor': missing, 'exposure': missing
+        }
+
+    positions = np.atleast_2d(np.asarray(positions))
+    if positions.shape != shape:
+        raise ValueError("positions must have the same shape as equity")
+
+    # A position held at the end of period t earns the return of period t+1.
+    held = positions[:, :-1] != 0
+    previous = np.concatenate(
+        (np.zeros((n_backtests, 1), dtype=bool), held[:, :-1]), axis=1
+    )
+    entries = held & ~previous
+
+    # Number every trade globally so bincount can sum returns per trade.
+    trade_ids = np.cumsum(entries.ravel()).reshape(held.shape) - 1
+    total_trades = int(entries.sum())
+    trade_returns = np.expm1(np.bincount(
+        trade_ids[held], weights=log_returns[held], minlength=total_trades
+    ))
+    trade_rows = np.nonzero(entries)[0]
+
+    trades = np.bincount(trade_rows, minlength=n_backtests).astype(np.float64)
+    wins = np.bincount(trade_rows, weights=trade_returns > 0, minlength=n_backtests)
+    gains = np.bincount(
+        trade_rows, weights=np.maximum(trade_returns, 0), minlength=n_backtests
+    )
+    losses = np.bincount(
+        trade_rows, weights=np.maximum(-trade_returns, 0), minlength=n_backtests
+    )
+    summed = np.bincount(trade_rows, weights=trade_returns, minlength=n_backtests)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {
+            'trades': trades,
+            'win_rate': wins / trades,
+            'avg_trade_return': summed / trades,
+            'profit_factor': gains / losses,
+            'exposure': held.mean(axis=1)
+        }
+
+
+def stack_curves(curves: Sequence[Sequence[float]]) -> np.ndarray:
+    """Stack equity curves of different lengths, holding each final value."""
+    length = max(len(curve) for curve in curves)
+    matrix = np.empty((len(curves), length))
+    for row, curve in enumerate(curves):
+        matrix[row, :len(curve)] = curve
+        matrix[row, len(curve):] = curve[-1]
+    return matrix
+
@@ -2,14 +2,15 @@ import numpy as np
 import pandas as pd
 from typing import List, Dict, Tuple
 from ..strategies.strategy import AdvancedStrategy
-from ..market_data.price_feed import PriceFeed
 from ..portfolio.portfolio_manager import PortfolioManager
 from ..utils.logger import get_logger
+from .analytics import Tearsheet, compute_tearsheet, stack_curves
 
 logger = get_logger(__name__)
 
 def calculate_returns(prices: List[float]) -> np.ndarray:
     """Calculate the returns of a price series."""
+    prices = np.asarray(prices, dtype=np.float64)
     returns = np.diff(prices) / prices[:-1]
     return returns
 
@@ -20,18 +21,25 @@ def calculate_volatility(returns: np.ndarray) -> float:
 def backtest_strategy(
     historical_data: List[Dict],
     strategy: AdvancedStrategy,
-    initial_balance: float = 10000
+    initial_balance: float = 10000,
+    window: int = 100
 ) -> Dict:
-    """Backtest a trading strategy on historical data."""
+    """Backtest a trading strategy on historical data.
+
+    Each candle only sees the ``window`` candles up to and including itself,
+    so signals never use future prices and the cost per candle is bounded.
+    """
     portfolio = PortfolioManager(initial_balance=initial_balance, risk_percentage=1.0)
-    price_feed = PriceFeed({'initial_price': historical_data[0]['close'], 'history_size': len(historical_data)})
-    price_feed.price_history = historical_data
+    equity_curve = []
+    positions = []
 
-    for candle in historical_data:
+    for index, candle in enumerate(historical_data):
         current_price = candle['close']
         portfolio.update_value(current_price)
         
-        signals = strategy.generate_signals(price_feed.get_historical_data())
+        signals = strategy.generate_signals(
+            historical_data[max(0, index + 1 - window):index + 1]
+        )
         
         if signals.should_trade:
             position_size = portfolio.balance * (portfolio.risk_percentage / 100) / current_price
@@ -40,6 +48,9 @@ def backtest_strategy(
                 portfolio.execute_buy(current_price, position_size)
             elif signals.action == 'sell' and portfolio.has_position:
                 portfolio.execute_sell(current_price)
+
+        equity_curve.append(portfolio.get_total_value(current_price))
+        positions.append(portfolio.current_position.size if portfolio.has_position else 0.0)
     
     final_value = portfolio.get_total_value(historical_data[-1]['close'])
     pnl_percentage = (final_value - initial_balance) / initial_balance * 100
@@ -52,9 +63,26 @@ def backtest_strategy(
         'total_trades': portfolio.total_trades,
         'winning_trades': portfolio.winning_trades,
         'win_rate': portfolio.winning_trades / portfolio.total_trades * 100 if portfolio.total_trades > 0 else 0,
-        'max_drawdown': portfolio.max_drawdown
+        'max_drawdown': portfolio.max_drawdown,
+        'equity_curve': equity_curve,
+        'positions': positions
     }
 
+def tearsheet_from_results(
+    results: Dict[str, Dict],
+    periods_per_year: int = 252,
+    window: int = 20
+) -> Tearsheet:
+    """Build one tearsheet from many ``backtest_strategy`` results, keyed by name."""
+    names = list(results)
+    return compute_tearsheet(
+        stack_curves([results[name]['equity_curve'] for name in names]),
+        positions=stack_curves([results[name]['positions'] for name in names]),
+        periods_per_year=periods_per_year,
+        window=window,
+        names=names
+    )
+
 def calculate_technical_indicators(data: List[Dict], config: Dict) -> Dict:
     """Calculate various technical indicators for the given data."""
     prices = np.array([candle['close'] for candle in data])
@@ -5,6 +5,10 @@ from typing import Optional
 def setup_logger() -> logging.Logger:
     logger = logging.getLogger('TradingBot')
     logger.setLevel(logging.INFO)
+    # Calling this again (e.g. for a second bot in one process) must not
+    # stack handlers and print every line twice.
+    if logger.handlers:
+        return logger
     
     formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
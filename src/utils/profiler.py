@@ -0,0 +1,223 @@
+import cProfile
+import io
+import os
+import pstats
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+from .logger import get_logger
+
+_IDLE = nullcontext()
+
+
+class SamplingProfiler:
+    """Samples one thread's call stack from a background thread.
+
+    Stacks are aggregated as root-to-leaf tuples, which is all the collapsed
+    (flamegraph.pl / speedscope) format and per-function totals need. The
+    sampled thread is never paused, so the overhead is one stack walk per
+    ``interval``.
+    """
+
+    def __init__(self, thread_id: int, interval: float = 0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, duration: Optional[float] = None, on_done=None) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(duration, on_done), name='sampling-profiler',
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _run(self, duration: Optional[float], on_done) -> None:
+        deadline = time.monotonic() + duration if duration else None
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                break
+            self.samples[_stack(frame)] += 1
+            del frame
+            if deadline and time.monotonic() >= deadline:
+                break
+        if on_done:
+            on_done(self)
+
+    def collapsed(self) -> str:
+        return ''.join(
+            f"{';'.join(stack)} {count}\n"
+            for stack, count in self.samples.most_common()
+        )
+
+    def function_times(self) -> Dict[str, Tuple[float, float]]:
+        """Map each function to (cumulative, self) seconds."""
+        cumulative: Counter = Counter()
+        own: Counter = Counter()
+        for stack, count in self.samples.items():
+            for function in set(stack):
+                cumulative[function] += count
+            own[stack[-1]] += count
+        return {
+            function: (count * self.interval, own[function] * self.interval)
+            for function, count in cumulative.items()
+        }
+
+
+def _stack(frame) -> Tuple[str, ...]:
+    stack = []
+    while frame is not None:
+        code = frame.f_code
+        stack.append(
+            f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+        )
+        frame = frame.f_back
+    stack.reverse()
+    return tuple(stack)
+
+
+class LoopProfiler:
+    """Opt-in profiling of a trading loop without restarting it.
+
+    Wrap each iteration in ``iteration()``. A capture is armed by the
+    ``profiling`` config section at startup, by ``request()`` or by SIGUSR1
+    where available. ``sampling`` mode samples the loop thread for
+    ``duration`` seconds and writes collapsed stacks plus per-function
+    times; ``cprofile`` mode profiles the next ``iterations`` iterations
+    and writes a ``.prof`` file plus a cumulative-time listing. Either way
+    the loop keeps running while the capture is taken.
+    """
+
+    def __init__(self, config: Dict, name: str):
+        self.logger = get_logger(__name__)
+        settings = config.get('profiling') or {}
+        self.name = name
+        self.mode = settings.get('mode', 'sampling')
+        self.duration = settings.get('duration', 30)
+        self.iterations = settings.get('iterations', 100)
+        self.interval = settings.get('interval', 0.005)
+        self.output_dir = settings.get('output_dir', 'profiles')
+
+        self._requested: Optional[str] = self.mode if settings.get('enabled') else None
+        self._sampler: Optional[SamplingProfiler] = None
+        self._cprofile: Optional[cProfile.Profile] = None
+        self._remaining = 0
+        self._capture_stamp = ''
+
+        if settings.get('signal', True):
+            self._install_signal_handler()
+
+    def _install_signal_handler(self) -> None:
+        if not hasattr(signal, 'SIGUSR1'):
+            return
+        if threading.current_thread() is not threading.main_thread():
+            return
+        signal.signal(signal.SIGUSR1, lambda signum, frame: self.request())
+
+    def request(self, mode: Optional[str] = None) -> None:
+        self._requested = mode or self.mode
+
+    @property
+    def active(self) -> bool:
+        return self._sampler is not None or self._cprofile is not None
+
+    def iteration(self):
+        if self._requested is None and self._cprofile is None:
+            return _IDLE
+        return self._profiled_iteration()
+
+    @contextmanager
+    def _profiled_iteration(self):
+        if self._requested is not None and not self.active:
+            self._begin(self._requested)
+        self._requested = None
+
+        if self._cprofile is None:
+            yield
+            return
+
+        self._cprofile.enable()
+        try:
+            yield
+        finally:
+            self._cprofile.disable()
+            self._remaining -= 1
+            if self._remaining <= 0:
+                self._write_cprofile()
+
+    def _begin(self, mode: str) -> None:
+        self._capture_stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        if mode == 'cprofile':
+            self.logger.info(
+                f"Profiling {self.name} with cProfile for {self.iterations} iterations"
+            )
+            self._cprofile = cProfile.Profile()
+            self._remaining = self.iterations
+        else:
+            self.logger.info(f"Sampling {self.name} for {self.duration}s")
+            self._sampler = SamplingProfiler(threading.get_ident(), self.interval)
+            self._sampler.start(self.duration, on_done=self._write_samples)
+
+    def _output_path(self, suffix: str) -> str:
+        os.makedirs(self.output_dir, exist_ok=True)
+        return os.path.join(
+            self.output_dir, f"{self.name}-{self._capture_stamp}{suffix}"
+        )
+
+    def _write_samples(self, sampler: SamplingProfiler) -> None:
+        try:
+            collapsed_path = self._output_path('.collapsed')
+            with open(collapsed_path, 'w') as f:
+                f.write(sampler.collapsed())
+
+            times = sorted(
+                sampler.function_times().items(),
+                key=lambda item: item[1][0],
+                reverse=True
+            )
+            with open(self._output_path('-functions.txt'), 'w') as f:
+                f.write(f"{'cumulative_s':>12} {'self_s':>10}  function\n")
+                for function, (cumulative, own) in times:
+                    f.write(f"{cumulative:12.3f} {own:10.3f}  {function}\n")
+
+            self.logger.info(
+                f"Wrote {sum(sampler.samples.values())} samples to {collapsed_path}"
+            )
+        except Exception as e:
+            self.logger.error(f"Error writing profile: {e}", exc_info=True)
+        finally:
+            self._sampler = None
+
+    def _write_cprofile(self) -> None:
+        profile, self._cprofile = self._cprofile, None
+        try:
+            prof_path = self._output_path('.prof')
+            profile.dump_stats(prof_path)
+
+            listing = io.StringIO()
+            pstats.Stats(profile, stream=listing).sort_stats('cumulative').print_stats()
+            with open(self._output_path('-functions.txt'), 'w') as f:
+                f.write(listing.getvalue())
+
+            self.logger.info(f"Wrote cProfile stats to {prof_path}")
+        except Exception as e:
+            self.logger.error(f"Error writing profile: {e}", exc_info=True)
+
+    def stop(self) -> None:
+        if self._sampler is not None:
+            self._sampler.stop()
+        if self._cprofile is not None:
+            self._write_cprofile()
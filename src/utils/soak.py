@@ -0,0 +1,538 @@
+import argparse
+import gc
+import logging
+import os
+import resource
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from ..config import load_config
+from ..market_data.price_feed import PriceFeed
+from .logger import get_logger
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+class SyntheticTicks:
+    """Endless geometric random walk, drawn from NumPy in blocks.
+
+    The block is kept as an array and prices are boxed one at a time, so
+    the generator's own footprint is constant and does not show up in the
+    soak's memory measurements.
+    """
+
+    def __init__(
+        self,
+        initial_price: float = 2000.0,
+        volatility: float = 0.002,
+        seed: Optional[int] = None,
+        block: int = 4096
+    ):
+        self.price = initial_price
+        self.volatility = volatility
+        self.rng = np.random.default_rng(seed)
+        self._path = np.empty(block)
+        self._steps = np.empty(block)
+        self._index = block
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> float:
+        if self._index == len(self._path):
+            self.rng.standard_normal(out=self._steps)
+            self._steps *= self.volatility
+            np.cumsum(self._steps, out=self._path)
+            np.exp(self._path, out=self._path)
+            self._path *= self.price
+            self._index = 0
+        self.price = float(self._path[self._index])
+        self._index += 1
+        return self.price
+
+
+class SyntheticPriceFeed(PriceFeed):
+    """PriceFeed whose new candles come from a ``SyntheticTicks`` firehose.
+
+    Candle timestamps advance by ``candle_seconds`` per tick rather than
+    with the wall clock, so the strategy sees a full candle on every tick
+    however fast ticks arrive.
+    """
+
+    def __init__(self, config: Dict, ticks: SyntheticTicks, candle_seconds: float):
+        super().__init__(config)
+        self.ticks = ticks
+        self.candle_seconds = timedelta(seconds=candle_seconds)
+        self.clock = self.price_history[-1]['timestamp']
+
+    def get_latest_price(self) -> float:
+        price = next(self.ticks)
+        self.clock += self.candle_seconds
+        self.push_price(price, self.clock, volume=1.0)
+        return price
+
+
+class MockExchange:
+    """Just enough of a ccxt exchange for ``TradingBot`` to run offline."""
+
+    def __init__(self, ticks: SyntheticTicks, spread_bps: float = 2.0, depth: int = 20):
+        self.ticks = ticks
+        self.spread_bps = spread_bps
+        self.depth = depth
+        self.last = ticks.price
+        self.orders = 0
+
+    def fetch_ticker(self, symbol: str) -> Dict:
+        self.last = next(self.ticks)
+        return {'symbol': symbol, 'last': self.last, 'timestamp': time.time() * 1000}
+
+    def fetch_order_book(self, symbol: str, limit: Optional[int] = None) -> Dict:
+        levels = min(limit or self.depth, self.depth)
+        # Centred on the newest tick, whoever drew it.
+        price = self.ticks.price
+        half_spread = price * self.spread_bps / 20000
+        steps = np.arange(levels) * half_spread
+        return {
+            'symbol': symbol,
+            'bids': [[price - half_spread - step, 1.0] for step in steps],
+            'asks': [[price + half_spread + step, 1.0] for step in steps],
+            'timestamp': time.time() * 1000
+        }
+
+    def create_market_buy_order(self, symbol: str, amount: float) -> Dict:
+        return self._fill(symbol, 'buy', amount)
+
+    def create_market_sell_order(self, symbol: str, amount: float) -> Dict:
+        return self._fill(symbol, 'sell', amount)
+
+    def _fill(self, symbol: str, side: str, amount: float) -> Dict:
+        self.orders += 1
+        return {
+            'id': str(self.orders), 'symbol': symbol, 'side': side,
+            'amount': amount, 'price': self.last, 'status': 'closed'
+        }
+
+
+def _engine_target(config: Dict, ticks: SyntheticTicks):
+    from ..core.engine import TradingEngine
+    engine = TradingEngine(config, exchange=MockExchange(ticks))
+    engine.price_feed = SyntheticPriceFeed(
+        config, ticks, config.get('update_interval', 60)
+    )
+    return engine, engine.update
+
+
+def _advanced_target(config: Dict, ticks: SyntheticTicks):
+    from ..advanced_trading_bot import AdvancedTradingBot
+    bot = AdvancedTradingBot(config)
+    bot.price_feed = SyntheticPriceFeed(
+        config, ticks, config.get('update_interval', 60)
+    )
+    return bot, bot.step
+
+
+def _trading_bot_target(config: Dict, ticks: SyntheticTicks):
+    from trading_bot import TradingBot
+    bot = TradingBot(mode='simulation', config=config, exchange=MockExchange(ticks))
+    bot.start()
+    return bot, bot.step
+
+
+TARGETS: Dict[str, Callable] = {
+    'engine': _engine_target,
+    'advanced': _advanced_target,
+    'trading_bot': _trading_bot_target,
+}
+
+
+class ErrorCounter(logging.Handler):
+    """Counts error records logged anywhere while attached to the root logger.
+
+    Trading loops catch and log their own exceptions, so a loop that fails
+    on every tick would otherwise look fast and flat to the soak.
+    """
+
+    def __init__(self, keep: int = 5):
+        super().__init__(logging.ERROR)
+        self.count = 0
+        self.keep = keep
+        self.first: List[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.add(f"{record.name}: {record.getMessage()}")
+
+    def add(self, message: str) -> None:
+        self.count += 1
+        if len(self.first) < self.keep:
+            self.first.append(message)
+
+
+@dataclass
+class SoakSample:
+    elapsed: float
+    ticks: int
+    rate: float
+    p50_ms: float
+    p99_ms: float
+    p999_ms: float
+    max_ms: float
+    lag: float
+    rss_mb: float
+    traced_mb: float
+    blocks: int
+    gc_objects: int
+
+
+_SAMPLE_FIELDS = tuple(SoakSample.__dataclass_fields__)
+_COUNT_FIELDS = ('ticks', 'blocks', 'gc_objects')
+
+
+@dataclass
+class SoakReport:
+    target: str
+    rate: Optional[float]
+    duration: float
+    ticks: int
+    samples: List[SoakSample]
+    growth: Dict[str, float] = field(default_factory=dict)
+    top_allocations: List[str] = field(default_factory=list)
+    errors: int = 0
+    first_errors: List[str] = field(default_factory=list)
+    failures: List[str] = field(default_factory=list)
+
+    @property
+    def passed(self) -> bool:
+        return not self.failures
+
+    @property
+    def achieved_rate(self) -> float:
+        return self.ticks / self.duration if self.duration else 0.0
+
+    def summary(self) -> Dict:
+        last = self.samples[-1] if self.samples else None
+        return {
+            'target': self.target,
+            'requested_rate': self.rate,
+            'achieved_rate': self.achieved_rate,
+            'ticks': self.ticks,
+            'worst_p99_ms': max((s.p99_ms for s in self.samples), default=0.0),
+            'final_lag': last.lag if last else 0.0,
+            'final_rss_mb': last.rss_mb if last else 0.0,
+            'growth_per_million_ticks': self.growth,
+            'errors': self.errors,
+            'passed': self.passed,
+            'failures': self.failures
+        }
+
+
+def rss_bytes() -> int:
+    """Current resident set size; the peak where /proc is not available."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and kilobytes elsewhere.
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class SoakHarness:
+    """Drives one trading loop with a synthetic tick firehose.
+
+    Ticks are issued open-loop at ``rate`` per second (as fast as possible
+    when ``rate`` is None) against a mock exchange, for ``duration``
+    seconds. Every ``sample_interval`` seconds the harness records tail
+    latency of the loop's step, how far it has fallen behind schedule,
+    RSS, tracemalloc'd bytes and allocated block and GC object counts.
+    After ``warmup`` the memory series must be flat: a slope above the
+    configured growth per million ticks, both over the whole run and over
+    its second half, fails the soak, and the tracemalloc diff against the
+    end of warmup points at the lines responsible. Any error logged or
+    exception raised by the loop fails it too.
+    """
+
+    def __init__(
+        self,
+        target: str,
+        config: Optional[Dict] = None,
+        rate: Optional[float] = None,
+        duration: Optional[float] = None,
+        trace_memory: bool = True,
+        check_memory: bool = True
+    ):
+        if target not in TARGETS:
+            raise ValueError(f"Unknown soak target: {target}")
+
+        self.logger = get_logger(__name__)
+        self.target = target
+        self.config = config or load_config()
+        settings = self.config.get('soak') or {}
+        self.rate = rate if rate is not None else settings.get('rate')
+        self.duration = duration if duration is not None else settings.get('duration', 60)
+        self.sample_interval = settings.get('sample_interval', 5)
+        self.warmup = settings.get('warmup', min(30, self.duration / 5))
+        self.max_lag = settings.get('max_lag', 1.0)
+        self.max_bytes_growth = settings.get('max_bytes_per_million_ticks', 1_000_000)
+        self.max_blocks_growth = settings.get('max_blocks_per_million_ticks', 10_000)
+        self.log_level = settings.get('log_level', 'WARNING')
+        self.trace_memory = trace_memory
+        self.check_memory = check_memory
+
+        self.ticks = SyntheticTicks(
+            self.config.get('initial_price', 2000),
+            self.config.get('volatility', 0.002),
+            seed=settings.get('seed')
+        )
+        self.owner, self.step = TARGETS[target](self.config, self.ticks)
+
+    def run(self) -> SoakReport:
+        logging.disable(getattr(logging, self.log_level) - 1)
+        errors = ErrorCounter()
+        logging.getLogger().addHandler(errors)
+        if self.trace_memory:
+            tracemalloc.start()
+        try:
+            samples, ticks, elapsed, baseline = self._drive(errors)
+            report = SoakReport(
+                target=self.target,
+                rate=self.rate,
+                duration=elapsed,
+                ticks=ticks,
+                samples=samples,
+                errors=errors.count,
+                first_errors=errors.first
+            )
+            self._check(report, baseline)
+        finally:
+            if self.trace_memory:
+                tracemalloc.stop()
+            logging.getLogger().removeHandler(errors)
+            logging.disable(logging.NOTSET)
+
+        if report.passed:
+            self.logger.info(f"Soak passed: {report.summary()}")
+        else:
+            self.logger.warning(f"Soak failed: {report.summary()}")
+        return report
+
+    def _drive(
+        self,
+        errors: ErrorCounter
+    ) -> Tuple[List[SoakSample], int, float, Optional[tracemalloc.Snapshot]]:
+        clock = time.perf_counter
+        interval = 1 / self.rate if self.rate else 0.0
+        # The harness's own buffers are preallocated (samples) or reused and
+        # only ever grown (latencies) so they don't register as growth of
+        # the loop under test.
+        records = np.zeros((int(self.duration / self.sample_interval) + 2, len(_SAMPLE_FIELDS)))
+        recorded = 0
+        latencies = np.empty(1024)
+        count = 0
+        baseline = None
+
+        start = clock()
+        next_sample = start + self.sample_interval
+        window_start, window_ticks = start, 0
+        tick = 0
+
+        while True:
+            now = clock()
+            if now - start >= self.duration:
+                break
+
+            scheduled = start + tick * interval if interval else now
+            if scheduled - now > 0.0005:
+                time.sleep(scheduled - now)
+
+            began = clock()
+            try:
+                self.step()
+            except Exception as e:
+                errors.add(f"{type(e).__name__} raised by step: {e}")
+            finished = clock()
+            if count == len(latencies):
+                latencies = np.concatenate((latencies, np.empty(count)))
+            latencies[count] = finished - began
+            count += 1
+            tick += 1
+
+            if finished >= next_sample:
+                if self.trace_memory and baseline is None and finished - start >= self.warmup:
+                    baseline = tracemalloc.take_snapshot()
+                lag = max(0.0, finished - (start + tick * interval)) if interval else 0.0
+                if recorded < len(records):
+                    records[recorded] = self._sample(
+                        finished - start, tick,
+                        (tick - window_ticks) / (finished - window_start),
+                        latencies[:count], lag
+                    )
+                    recorded += 1
+                count = 0
+                window_start, window_ticks = finished, tick
+                next_sample += self.sample_interval * (
+                    1 + int((finished - next_sample) // self.sample_interval)
+                )
+
+        samples = [
+            SoakSample(**{
+                name: int(value) if name in _COUNT_FIELDS else float(value)
+                for name, value in zip(_SAMPLE_FIELDS, row)
+            })
+            for row in records[:recorded]
+        ]
+        return samples, tick, clock() - start, baseline
+
+    def _sample(
+        self,
+        elapsed: float,
+        ticks: int,
+        rate: float,
+        latencies: np.ndarray,
+        lag: float
+    ) -> Tuple:
+        p50, p99, p999 = np.percentile(latencies, [50, 99, 99.9]) * 1000
+        traced = tracemalloc.get_traced_memory()[0] / 1e6 if self.trace_memory else 0.0
+        return (
+            elapsed, ticks, rate, p50, p99, p999, latencies.max() * 1000, lag,
+            rss_bytes() / 1e6, traced, sys.getallocatedblocks(), len(gc.get_objects())
+        )
+
+    def _check(self, report: SoakReport, baseline: Optional[tracemalloc.Snapshot]) -> None:
+        if report.errors:
+            report.failures.append(
+                f"{report.errors} errors, first: {report.first_errors[0]}"
+            )
+        if self.rate and report.samples:
+            lag = report.samples[-1].lag
+            # Behind by a growing share of the run means the rate is above
+            # capacity even if the absolute lag is still small.
+            if lag > min(self.max_lag, report.duration * 0.02):
+                report.failures.append(f"fell {lag:.2f}s behind {self.rate} ticks/s")
+        if not self.check_memory:
+            return
+
+        steady = [s for s in report.samples if s.elapsed >= self.warmup]
+        if len(steady) < 4:
+            report.failures.append("too few samples after warmup to judge memory growth")
+            return
+
+        memory = 'traced_mb' if self.trace_memory else 'rss_mb'
+        limits = {memory: self.max_bytes_growth / 1e6, 'blocks': self.max_blocks_growth}
+        for metric, limit in limits.items():
+            overall = _growth_per_million(steady, metric)
+            recent = _growth_per_million(steady[len(steady) // 2:], metric)
+            report.growth[metric] = overall
+            if overall > limit and recent > limit:
+                report.failures.append(
+                    f"{metric} grows {overall:.2f} per million ticks (limit {limit})"
+                )
+
+        if baseline is not None:
+            diff = tracemalloc.take_snapshot().compare_to(baseline, 'lineno')
+            report.top_allocations = [str(stat) for stat in diff[:10]]
+
+
+def _growth_per_million(samples: List[SoakSample], metric: str) -> float:
+    ticks = np.array([s.ticks for s in samples], dtype=np.float64)
+    values = np.array([getattr(s, metric) for s in samples], dtype=np.float64)
+    if len(samples) < 2 or ticks[-1] == ticks[0]:
+        return 0.0
+    slope = np.polyfit(ticks, values, 1)[0]
+    return float(slope * 1_000_000)
+
+
+def find_max_rate(
+    target: str,
+    config: Optional[Dict] = None,
+    trial_duration: float = 10.0,
+    steps: int = 6,
+    latency_budget_ms: Optional[float] = None
+) -> float:
+    """Highest tick rate the target keeps up with, by binary search.
+
+    The closed-loop throughput bounds the search; each trial then runs a
+    fresh target open-loop and passes when it ends less than ``max_lag``
+    behind schedule and less than 2% of the trial (and, if given, with p99
+    under ``latency_budget_ms``).
+    Memory is not traced during the search.
+    """
+    logger = get_logger(__name__)
+    config = config or load_config()
+    soak = {
+        **(config.get('soak') or {}),
+        'rate': None, 'warmup': 0, 'sample_interval': trial_duration / 5
+    }
+    config = {**config, 'soak': soak}
+
+    def trial(rate: Optional[float]) -> SoakReport:
+        return SoakHarness(
+            target, config, rate, trial_duration,
+            trace_memory=False, check_memory=False
+        ).run()
+
+    def sustained(rate: float) -> bool:
+        report = trial(rate)
+        worst_p99 = report.summary()['worst_p99_ms']
+        return report.passed and (
+            latency_budget_ms is None or worst_p99 <= latency_budget_ms
+        )
+
+    ceiling = trial(None).achieved_rate
+    low, high = 0.0, ceiling
+    if sustained(ceiling):
+        return ceiling
+
+    for _ in range(steps):
+        rate = (low + high) / 2
+        passed = sustained(rate)
+        logger.info(f"{target} at {rate:.0f} ticks/s: {'ok' if passed else 'behind'}")
+        if passed:
+            low = rate
+        else:
+            high = rate
+    return low
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Soak test a trading loop")
+    parser.add_argument('--target', choices=sorted(TARGETS), default='engine')
+    parser.add_argument('--rate', type=float, help="ticks per second (default: unpaced)")
+    parser.add_argument('--duration', type=float, help="seconds to run")
+    parser.add_argument('--find-max-rate', action='store_true')
+    parser.add_argument('--no-tracemalloc', action='store_true')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    config = load_config()
+
+    if args.find_max_rate:
+        rate = find_max_rate(args.target, config, trial_duration=args.duration or 10.0)
+        print(f"{args.target}: max sustainable rate {rate:.0f} ticks/s")
+        return 0
+
+    report = SoakHarness(
+        args.target, config, args.rate, args.duration,
+        trace_memory=not args.no_tracemalloc
+    ).run()
+
+    print(f"{'elapsed':>8} {'ticks':>10} {'rate':>9} {'p50ms':>7} {'p99ms':>7} "
+          f"{'p999ms':>7} {'lag_s':>6} {'rss_mb':>7} {'traced':>7} {'blocks':>9}")
+    for sample in report.samples:
+        print(f"{sample.elapsed:8.0f} {sample.ticks:10d} {sample.rate:9.0f} "
+              f"{sample.p50_ms:7.3f} {sample.p99_ms:7.3f} {sample.p999_ms:7.3f} "
+              f"{sample.lag:6.2f} {sample.rss_mb:7.1f} {sample.traced_mb:7.2f} "
+              f"{sample.blocks:9d}")
+    for line in report.top_allocations:
+        print(line)
+    for line in report.first_errors:
+        print(line)
+    print(report.summary())
+    return 0 if report.passed else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
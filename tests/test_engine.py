@@ -0,0 +1,126 @@
+from dataclasses import replace
+from datetime import timedelta
+import pytest
+from src.core.engine import TradingEngine
+from src.strategies.combined_strategy import SignalResult
+from src.utils.soak import MockExchange, SyntheticTicks
+
+
+def _engine(**overrides):
+    config = {
+        'initial_balance': 10000,
+        'initial_price': 2000,
+        'history_size': 50,
+        'stop_loss_percentage': 2.0,
+        'take_profit_percentage': 5.0,
+    }
+    config.update(overrides)
+    engine = TradingEngine(config)
+    # Keep the strategy out of it: ticks a second apart never reach a signal update.
+    engine.last_update = engine.price_feed.price_history[-1]['timestamp']
+    return engine
+
+
+def _tick(engine, price, seconds=1):
+    timestamp = engine.price_feed.price_history[-1]['timestamp'] + timedelta(seconds=seconds)
+    engine.replay_tick(price, timestamp)
+
+
+def test_stop_loss_closes_position():
+    engine = _engine()
+    engine._open_position(2000.0, 1.0)
+    assert engine.portfolio.has_position
+    assert engine.position_id is not None
+
+    _tick(engine, 1990.0)
+    assert engine.portfolio.has_position
+
+    _tick(engine, 1950.0)
+    assert not engine.portfolio.has_position
+    assert engine.position_id is None
+    assert engine.portfolio.total_trades == 1
+    assert engine.portfolio.balance == 10000 - 2000.0 + 1950.0
+
+
+def test_take_profit_closes_position():
+    engine = _engine()
+    engine._open_position(2000.0, 1.0)
+
+    _tick(engine, 2110.0)
+    assert not engine.portfolio.has_position
+    assert engine.portfolio.winning_trades == 1
+
+
+def test_trailing_stop_follows_price():
+    engine = _engine(take_profit_percentage=50.0, trailing_stop_percentage=1.0)
+    engine._open_position(2000.0, 1.0)
+
+    _tick(engine, 2200.0)
+    _tick(engine, 2190.0)
+    assert engine.portfolio.has_position
+
+    _tick(engine, 2170.0)
+    assert not engine.portfolio.has_position
+    assert engine.portfolio.winning_trades == 1
+
+
+@pytest.mark.parametrize('size', [0.0, -0.5, float('nan')])
+def test_non_positive_size_opens_nothing(size):
+    engine = _engine()
+    engine._open_position(2000.0, size)
+    assert not engine.portfolio.has_position
+    assert engine.position_id is None
+    assert len(engine.trigger_book) == 0
+    assert engine.portfolio.balance == 10000
+
+
+def test_order_book_gates_signals_and_caps_size():
+    ticks = SyntheticTicks(2000.0, seed=1)
+    engine = TradingEngine(
+        {'initial_balance': 10_000_000, 'initial_price': 2000, 'history_size': 50,
+         'use_order_book': True, 'max_slippage_bps': 10.0},
+        exchange=MockExchange(ticks, spread_bps=2.0)
+    )
+    seen = []
+    generate_signals = engine.strategy.generate_signals
+    engine.strategy.generate_signals = lambda data, book=None: (
+        seen.append(book) or generate_signals(data, book)
+    )
+
+    engine.update()
+    assert seen and seen[0].spread_bps == pytest.approx(2.0)
+    history = engine.price_feed.get_historical_data()
+    wide = replace(seen[0], spread_bps=100.0)
+    assert not engine.strategy.generate_signals(history, wide).should_trade
+
+    book_features, liquidity = engine._poll_order_book()
+    assert 0 < liquidity['buy'] < 20
+    signals = SignalResult(action='buy', should_trade=True, risk_score=1.0, confidence=1.0)
+    engine._apply_signals(signals, ticks.price, liquidity)
+    # 1% of 10M would be ~50 units; the book only fills part of that within 10 bps.
+    assert engine.portfolio.current_position.size == liquidity['buy']
+
+
+def test_empty_book_side_skips_the_buy():
+    engine = _engine()
+    signals = SignalResult(action='buy', should_trade=True, risk_score=1.0, confidence=1.0)
+    engine._apply_signals(signals, 2000.0, {'buy': 0.0, 'sell': 5.0})
+    assert not engine.portfolio.has_position
+    assert len(engine.trigger_book) == 0
+
+    engine._apply_signals(signals, 2000.0, {'buy': 0.02, 'sell': 5.0})
+    assert engine.portfolio.current_position.size == 0.02
+
+
+def test_traded_signals_carry_a_positive_risk_score():
+    # A single vote is enough to trade, so every break of the bands does.
+    engine = _engine(min_confidence=0.3)
+    ticks = SyntheticTicks(2000.0, seed=3)
+    traded = []
+    for _ in range(2000):
+        _tick(engine, next(ticks), seconds=60)
+        signals = engine.strategy.generate_signals(engine.price_feed.get_historical_data())
+        if signals.should_trade:
+            traded.append(signals.risk_score)
+    assert traded
+    assert all(0 < score <= 1 for score in traded)
@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+import numpy as np
+from src.ml.feature_pipeline import CloseWindow, FeatureWindow, feature_windows
+
+CONFIG = {'features': {'return_lags': [1, 5]}}
+WINDOW = 8
+
+
+def _closes(length):
+    rng = np.random.default_rng(1)
+    return 2000 * np.exp(np.cumsum(rng.normal(0, 0.01, length)))
+
+
+def _streamed(closes):
+    state = FeatureWindow(CONFIG, WINDOW)
+    for close in closes:
+        state.push(close)
+    return state.latest()
+
+
+def test_close_windows_update_incrementally():
+    closes = _closes(300)
+    windows = {}
+    for end in range(60, 301):
+        data = {'a': CloseWindow(closes[end - 50:end], end)}
+        ready = feature_windows(windows, data, CONFIG, WINDOW)
+
+    # One update per close, not one per close per call.
+    assert windows['a'].features.count == 300 - 10
+    np.testing.assert_array_equal(ready['a'], _streamed(closes[10:300]))
+
+
+def test_candles_update_incrementally_by_timestamp():
+    closes = _closes(200)
+    start = datetime(2024, 1, 1)
+    candles = [
+        {'timestamp': start + timedelta(minutes=i), 'close': close}
+        for i, close in enumerate(closes)
+    ]
+    windows = {}
+    for end in range(60, 201):
+        ready = feature_windows(windows, {'a': candles[end - 50:end]}, CONFIG, WINDOW)
+
+    assert windows['a'].features.count == 200 - 10
+    np.testing.assert_array_equal(ready['a'], _streamed(closes[10:200]))
+
+
+def test_gap_rebuilds_window():
+    closes = _closes(200)
+    windows = {}
+    feature_windows(windows, {'a': CloseWindow(closes[:50], 50)}, CONFIG, WINDOW)
+    ready = feature_windows(windows, {'a': CloseWindow(closes[100:150], 150)}, CONFIG, WINDOW)
+
+    assert windows['a'].features.count == 50
+    np.testing.assert_array_equal(ready['a'], _streamed(closes[100:150]))
@@ -0,0 +1,38 @@
+import pickle
+import numpy as np
+import pytest
+from src.indicators.backend import NumpyBackend, TalibBackend, talib
+from src.indicators.benchmark import check_parity, sample_prices, select_fastest
+
+
+def test_numpy_backend_matches_reference():
+    failures = check_parity(NumpyBackend())
+    assert not failures, '\n'.join(map(str, failures))
+
+
+@pytest.mark.skipif(talib is None, reason="TA-Lib is not installed")
+def test_talib_backend_matches_reference():
+    failures = check_parity(TalibBackend())
+    assert not failures, '\n'.join(map(str, failures))
+
+
+class ShiftedEMA(NumpyBackend):
+    name = 'shifted'
+
+    def ema(self, prices, period):
+        return super().ema(prices, period) * (1 + 1e-6)
+
+
+def test_parity_catches_a_wrong_indicator():
+    failed = {failure.indicator for failure in check_parity(ShiftedEMA())}
+    assert failed == {'ema'}
+
+
+def test_fastest_skips_backends_that_fail_parity():
+    backend = select_fastest({'numpy': NumpyBackend(), 'shifted': ShiftedEMA()}, length=200)
+    assert backend.choices['ema'].name == 'numpy'
+
+    # Workers in process pools receive the backend pickled.
+    restored = pickle.loads(pickle.dumps(backend))
+    prices = sample_prices(200)
+    np.testing.assert_array_equal(restored.ema(prices, 20), NumpyBackend().ema(prices, 20))
@@ -0,0 +1,31 @@
+from src.core.multi_strategy import MultiStrategyRunner
+from src.strategies.combined_strategy import SignalResult
+
+
+def test_strategies_share_indicator_results():
+    runner = MultiStrategyRunner({'history_size': 60}, strategies=[
+        {'name': 'a', 'type': 'combined'},
+        {'name': 'b', 'type': 'combined'},
+        {'name': 'slow', 'type': 'combined', 'params': {'ema_period': 50}},
+    ])
+    for _ in range(5):
+        runner.step()
+
+    results = runner.get_results()
+    assert set(results) == {'a', 'b', 'slow'}
+    assert all(status['signals_generated'] == 5 for status in results.values())
+    # 'b' reuses everything 'a' computed; 'slow' only adds its own EMA.
+    assert runner.indicator_cache.misses == 5 * 5
+    assert runner.indicator_cache.hits == 5 * 7
+
+
+def test_negative_size_registers_no_triggers():
+    runner = MultiStrategyRunner({'history_size': 60}, strategies=[{'name': 'a'}])
+    slot = runner.slots[0]
+    slot.strategy.generate_signals = lambda history: SignalResult(
+        action='buy', should_trade=True, risk_score=-0.4, confidence=1.0
+    )
+    runner.step()
+    assert not slot.portfolio.has_position
+    assert slot.position_id is None
+    assert len(runner.trigger_book) == 0
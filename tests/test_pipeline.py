@@ -0,0 +1,117 @@
+import threading
+import time
+from src.core.pipeline import PipelinedEngine
+from src.core.recorder import TRADE, SessionRecorder, SessionReplayer
+
+
+def _engine(tmp_path, **overrides):
+    config = {
+        'initial_price': 2000,
+        'history_size': 50,
+        'record_path': str(tmp_path / 'session.rec'),
+        'pipeline': {'execution_queue_size': 1},
+    }
+    config.update(overrides)
+    engine = PipelinedEngine(config)
+    prices = []
+
+    def next_price():
+        price = prices.pop(0)
+        engine.price_feed.push_price(price)
+        return price
+
+    engine.price_feed.get_latest_price = next_price
+    return engine, prices
+
+
+def _drain(engine):
+    while not engine.execution_queue.empty():
+        engine.execute(*engine.execution_queue.get_nowait())
+
+
+def test_dropped_tick_still_fires_stop(tmp_path):
+    engine, prices = _engine(tmp_path)
+    engine._open_position(2000.0, 1.0)
+    prices.extend([1999.0, 1900.0, 2000.0])
+
+    engine.ingest()
+    engine.ingest()
+    assert engine.ticks_dropped == 1
+    _drain(engine)
+    assert engine.portfolio.has_position
+
+    engine.ingest()
+    _drain(engine)
+    assert not engine.portfolio.has_position
+    assert engine.portfolio.balance == engine.portfolio.initial_balance - 100.0
+
+    engine.recorder.close()
+    trades = [d for d in SessionReplayer(engine.config['record_path']).decisions if d.kind == TRADE]
+    assert [(trade.action, trade.tick) for trade in trades] == [('buy', 0), ('stop_loss', 2)]
+
+
+def test_signal_is_recorded_against_its_tick(tmp_path):
+    engine, prices = _engine(tmp_path, pipeline={'execution_queue_size': 16})
+    prices.extend([2000.0, 2001.0, 2002.0])
+
+    engine.ingest()
+    tick = engine.signal_input.get(timeout=0)
+    signals = engine.strategy.generate_signals(tick.history)
+    engine.ingest()
+    engine.ingest()
+    _drain(engine)
+    engine.execute('signal', tick, signals)
+
+    engine.recorder.close()
+    decisions = SessionReplayer(engine.config['record_path']).decisions
+    assert [(d.action, d.tick) for d in decisions] == [(signals.action, 1)]
+
+
+def test_recorder_is_safe_across_threads(tmp_path):
+    path = str(tmp_path / 'threads.rec')
+    recorder = SessionRecorder(path, flush_every=7)
+    recorder.start({})
+
+    def write():
+        for _ in range(1000):
+            recorder.record_trade('buy', 1.0, 1.0)
+
+    threads = [threading.Thread(target=write) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    recorder.close()
+
+    assert len(SessionReplayer(path).decisions) == 4000
+
+
+def test_run_keeps_saving_snapshots(tmp_path):
+    config = {
+        'initial_price': 2000,
+        'history_size': 50,
+        'tick_interval': 0.01,
+        'snapshot_path': str(tmp_path / 'engine.snap'),
+        'snapshot_interval': 0.05,
+    }
+    engine = PipelinedEngine(config)
+    saved_by = []
+    save = engine.snapshots.save
+    engine.snapshots.save = lambda owner: (
+        saved_by.append(threading.current_thread().name), save(owner)
+    )
+
+    runner = threading.Thread(target=engine.run, name='runner')
+    runner.start()
+    deadline = time.monotonic() + 5
+    while 'execution' not in saved_by and time.monotonic() < deadline:
+        time.sleep(0.01)
+    engine.stop()
+    runner.join(timeout=5)
+
+    # Periodic saves come from the stage owning the portfolio, the last one
+    # from run() once every stage has stopped.
+    assert 'execution' in saved_by
+    assert saved_by[-1] == 'runner'
+    restarted = PipelinedEngine(config)
+    assert restarted.price_feed.price_history == engine.executed_history
@@ -0,0 +1,115 @@
+import threading
+import time
+from src.core.scheduler import CATCH_UP, SKIP, DeadlineScheduler
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _scheduler(now=0.0, wall=1000.0):
+    clock = FakeClock(now)
+    return DeadlineScheduler(clock=clock, wall_clock=lambda: wall + clock.now), clock
+
+
+def test_jobs_run_in_deadline_order():
+    scheduler, clock = _scheduler()
+    runs = []
+    scheduler.every(1.0, lambda: runs.append(('a', clock.now)), align=False, offset=1.0)
+    scheduler.every(1.25, lambda: runs.append(('b', clock.now)), align=False, offset=1.25)
+
+    while clock.now < 3.0:
+        clock.now += 0.25
+        scheduler.run_pending()
+    assert runs == [('a', 1.0), ('b', 1.25), ('a', 2.0), ('b', 2.5), ('a', 3.0)]
+
+
+def test_aligned_job_starts_on_a_period_boundary():
+    scheduler, clock = _scheduler(wall=1000.3)
+    scheduler.every(1.0, lambda: None)
+    assert abs(scheduler.next_deadline() - 0.7) < 1e-9
+
+
+def test_slow_jobs_do_not_drift():
+    scheduler, clock = _scheduler()
+    started = []
+
+    def slow():
+        started.append(clock.now)
+        clock.now += 0.3
+
+    scheduler.every(1.0, slow, align=False, offset=1.0)
+    for _ in range(3):
+        clock.now = scheduler.next_deadline()
+        scheduler.run_pending()
+    assert started == [1.0, 2.0, 3.0]
+
+
+def _fall_behind(policy, max_catch_up=10):
+    scheduler, clock = _scheduler()
+    calls = []
+
+    def job():
+        calls.append(clock.now)
+        if len(calls) == 1:
+            # The first run overruns three and a half periods.
+            clock.now += 3.5
+
+    job_ = scheduler.every(
+        1.0, job, align=False, offset=1.0, policy=policy, max_catch_up=max_catch_up
+    )
+    clock.now = 1.0
+    scheduler.run_pending()
+    scheduler.run_pending()
+    return job_, calls
+
+
+def test_skip_runs_once_and_moves_to_the_next_deadline():
+    job, calls = _fall_behind(SKIP)
+    assert len(calls) == 2
+    assert job.missed == 2
+    assert job.deadline == 5.0
+    assert job.last_lateness == 2.5
+
+
+def test_catch_up_runs_every_missed_deadline_up_to_the_bound():
+    job, calls = _fall_behind(CATCH_UP)
+    assert len(calls) == 1 + 3
+    assert job.missed == 0
+    assert job.deadline == 5.0
+
+    job, calls = _fall_behind(CATCH_UP, max_catch_up=2)
+    assert len(calls) == 1 + 2
+    assert job.missed == 1
+
+
+def test_stop_from_a_job_ends_run():
+    scheduler, clock = _scheduler()
+    runs = []
+
+    def job():
+        runs.append(clock.now)
+        clock.now += 1.0
+        if len(runs) == 3:
+            scheduler.stop()
+
+    scheduler.every(1.0, job, align=False)
+    scheduler.run()
+    assert runs == [0.0, 1.0, 2.0]
+    assert not scheduler.running
+
+
+def test_stop_wakes_a_sleeping_run():
+    scheduler = DeadlineScheduler()
+    scheduler.every(3600, lambda: None, align=False, offset=3600)
+    runner = threading.Thread(target=scheduler.run)
+    runner.start()
+    while not scheduler.running:
+        time.sleep(0.001)
+    scheduler.stop()
+    runner.join(timeout=5)
+    assert not runner.is_alive()
@@ -0,0 +1,107 @@
+import numpy as np
+from src.core.sharded_runner import ShardedRunner, ShardFill, SharedPriceRing, ShardPortfolio
+
+
+def test_portfolio_shares_one_balance_across_symbols():
+    prices = {'A': 100.0, 'B': 100.0, 'C': 100.0}
+    portfolio = ShardPortfolio(
+        {'initial_balance': 1000, 'risk_percentage': 40.0, 'max_exposure_percentage': 100.0},
+        prices.get
+    )
+
+    assert portfolio.buy('A', 100.0, 1.0) == 4.0
+    assert portfolio.buy('B', 100.0, 1.0) == 4.0
+    # Only 200 of the 1000 is left, not a fresh 1000 for C.
+    assert portfolio.buy('C', 100.0, 1.0) == 2.0
+    assert portfolio.balance == 0.0
+    assert portfolio.buy('A', 100.0, 1.0) == 0.0
+
+    prices['A'] = 150.0
+    assert portfolio.get_total_value() == 1200.0
+    assert portfolio.sell('A', 150.0) == 4.0
+    assert portfolio.balance == 600.0
+    assert portfolio.winning_trades == 1
+
+
+def test_portfolio_caps_gross_exposure():
+    prices = {'A': 100.0, 'B': 100.0}
+    portfolio = ShardPortfolio(
+        {'initial_balance': 1000, 'risk_percentage': 40.0, 'max_exposure_percentage': 50.0},
+        prices.get
+    )
+
+    assert portfolio.buy('A', 100.0, 1.0) == 4.0
+    assert portfolio.buy('B', 100.0, 1.0) == 1.0
+    assert portfolio.get_exposure() == 500.0
+
+
+def test_ring_window_reads_in_place_until_it_wraps():
+    ring = SharedPriceRing(n_symbols=2, capacity=4, n_workers=1)
+    try:
+        for price in (1.0, 2.0, 3.0):
+            ring.write(1, price)
+        window = ring.window(1, 4)
+        assert np.shares_memory(window, ring.prices)
+        np.testing.assert_array_equal(window, [1.0, 2.0, 3.0])
+        np.testing.assert_array_equal(ring.window(1, 4, count=2), [1.0, 2.0])
+
+        for price in (4.0, 5.0):
+            ring.write(1, price)
+        np.testing.assert_array_equal(ring.window(1, 4), [2.0, 3.0, 4.0, 5.0])
+        del window
+    finally:
+        ring.close()
+
+
+def test_ring_detects_writes_over_a_window_in_use():
+    ring = SharedPriceRing(n_symbols=1, capacity=6, n_workers=1)
+    try:
+        for price in (1.0, 2.0, 3.0, 4.0):
+            ring.write(0, price)
+        window = ring.window(0, 4)
+        ring.write(0, 5.0)
+        assert ring.intact(0, 4, len(window))
+        # The counter now points at the window's oldest slot.
+        ring.write(0, 6.0)
+        assert not ring.intact(0, 4, len(window))
+        del window
+    finally:
+        ring.close()
+
+
+def test_portfolio_copy_follows_fills():
+    config = {'initial_balance': 1000, 'risk_percentage': 40.0}
+    portfolio = ShardPortfolio(config, {'A': 100.0, 'B': 100.0}.get)
+    copy = ShardPortfolio(config, {'A': 100.0, 'B': 100.0}.get)
+    for fill in (
+        ShardFill('A', 'buy', 100.0, portfolio.buy('A', 100.0, 1.0)),
+        ShardFill('B', 'buy', 100.0, portfolio.buy('B', 100.0, 1.0)),
+        ShardFill('A', 'sell', 120.0, portfolio.sell('A', 120.0)),
+    ):
+        copy.record(fill)
+
+    restarted = ShardPortfolio(config, {}.get)
+    restarted.set_state(copy.get_state())
+    assert restarted.balance == portfolio.balance
+    assert restarted.positions.keys() == portfolio.positions.keys()
+    assert restarted.total_pnl == portfolio.total_pnl
+
+
+def test_dead_portfolio_process_is_restarted():
+    runner = ShardedRunner(
+        {'workers': 1, 'history_size': 20},
+        symbols=['A', 'B'],
+        price_source=lambda: {'A': 100.0, 'B': 200.0}
+    )
+    runner.start()
+    try:
+        dead = runner.portfolio_process
+        dead.terminate()
+        dead.join(timeout=5)
+
+        runner.check_workers()
+        assert runner.restarts == 1
+        assert runner.portfolio_process is not dead
+        assert runner.portfolio_process.is_alive()
+    finally:
+        runner.stop()
@@ -0,0 +1,33 @@
+import pytest
+from src.advanced_trading_bot import AdvancedTradingBot
+from src.core.engine import TradingEngine
+
+
+@pytest.mark.parametrize('bot_class', [TradingEngine, AdvancedTradingBot])
+@pytest.mark.parametrize('change, restored', [
+    ({'update_interval': 5}, True),
+    ({'record_path': None, 'snapshot_interval': 10}, True),
+    ({'ema_period': 30}, False),
+])
+def test_strategy_state_restored_only_for_same_strategy_config(
+    tmp_path, bot_class, change, restored
+):
+    config = {'snapshot_path': str(tmp_path / 'bot.snap'), 'update_interval': 60}
+    bot = bot_class(config)
+    bot.strategy.marker = 'saved'
+    bot.snapshots.save(bot)
+
+    restarted = bot_class({**config, **change})
+    assert restarted.price_feed.price_history == bot.price_feed.price_history
+    assert (getattr(restarted.strategy, 'marker', None) == 'saved') is restored
+
+
+def test_advanced_bot_saves_on_normal_exit(tmp_path):
+    config = {'snapshot_path': str(tmp_path / 'bot.snap'), 'update_interval': 0.01}
+    bot = AdvancedTradingBot(config)
+    step = bot.step
+    bot.step = lambda: (step(), bot.stop())
+    bot.run()
+
+    restarted = AdvancedTradingBot(config)
+    assert restarted.price_feed.price_history == bot.price_feed.price_history
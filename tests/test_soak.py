@@ -0,0 +1,41 @@
+from src.utils.soak import SoakHarness
+
+CONFIG = {'soak': {'sample_interval': 0.1, 'warmup': 0, 'seed': 1}}
+
+
+def _harness():
+    return SoakHarness(
+        'engine', dict(CONFIG), duration=0.5, trace_memory=False, check_memory=False
+    )
+
+
+def test_clean_run_passes():
+    report = _harness().run()
+    assert report.ticks > 0
+    assert report.errors == 0
+    assert report.passed
+
+
+def test_logged_errors_fail_the_soak():
+    harness = _harness()
+
+    def broken(*args, **kwargs):
+        raise ValueError("bad signal")
+
+    harness.owner.strategy.generate_signals = broken
+    report = harness.run()
+    assert report.errors > 0
+    assert not report.passed
+    assert 'bad signal' in report.failures[0]
+
+
+def test_raised_exceptions_fail_the_soak():
+    harness = _harness()
+
+    def broken():
+        raise RuntimeError("step blew up")
+
+    harness.step = broken
+    report = harness.run()
+    assert report.errors == report.ticks
+    assert 'RuntimeError raised by step: step blew up' in report.failures[0]
@@ -1,13 +1,17 @@
 import json
-import time
 import logging
+from collections import deque
 from datetime import datetime
 import ccxt
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from src.config import load_config
 from src.indicators import calculateEMA, calculateGChannel
 from src.risk_management import PositionSizer
+from src.core.recorder import SessionRecorder
+from src.utils.profiler import LoopProfiler
+from src.core.scheduler import DeadlineScheduler
+from src.market_data.order_book import OrderBookFeed
 
 # Configure logging
 logging.basicConfig(
@@ -19,14 +23,20 @@ logging.basicConfig(
 )
 
 class TradingBot:
-    def __init__(self, mode='simulation'):
-        self.config = load_config()
+    def __init__(self, mode='simulation', config: Optional[Dict] = None, exchange=None):
+        self.config = config or load_config()
         self.mode = mode
         self.position = {'base_amount': 0, 'quote_amount': self.config['initial_balance']}
-        self.trade_history = []
+        # Bounded so a long-running bot keeps a constant footprint; drawdown
+        # is tracked incrementally rather than recomputed from the history.
+        self.trade_history = deque(maxlen=self.config.get('trade_history_size', 1000))
         self.price_history = []
-        self.portfolio_value_history = []
-        self.price_fetcher = ccxt.binance({
+        self.portfolio_value_history = deque(
+            maxlen=self.config.get('portfolio_history_size', 10000)
+        )
+        self.peak_portfolio_value = None
+        self.max_drawdown = 0.0
+        self.price_fetcher = exchange or ccxt.binance({
             'apiKey': self.config['apiKey'],
             'secret': self.config['apiSecret'],
             'enableRateLimit': True,
@@ -34,15 +44,34 @@ class TradingBot:
         self.ema_period = self.config['ema_period']
         self.g_channel_length = self.config['g_channel_length']
         self.position_sizer = PositionSizer(self.config)
+        # EMA/G-Channel signals carry no confidence, so every trade takes the
+        # full risk_percentage.
+        self.risk_score = 1.0
+        self.initial_portfolio = None
+        self.profiler = LoopProfiler(self.config, 'trading_bot')
+        self.order_books = (
+            OrderBookFeed(self.config, exchange=self.price_fetcher)
+            if self.config.get('use_order_book') else None
+        )
+        self.recorder = (
+            SessionRecorder(self.config['record_path'])
+            if self.config.get('record_path') else None
+        )
 
     def fetch_price(self) -> float:
         """Fetch real-time price"""
         ticker = self.price_fetcher.fetch_ticker(self.config['symbol'])
         price = ticker['last']
+        self.append_price(price)
+        if self.order_books:
+            self.order_books.poll()
+        return price
+
+    def append_price(self, price: float) -> None:
+        """Add a price to the rolling history window"""
         self.price_history.append(price)
         if len(self.price_history) > self.ema_period:
             self.price_history = self.price_history[-self.ema_period:]
-        return price
 
     def calculate_ema(self) -> float:
         """Calculate EMA using price history"""
@@ -52,6 +81,14 @@ class TradingBot:
         """Calculate G-Channel signal using price history"""
         return calculateGChannel(self.price_history, self.g_channel_length)
 
+    def limit_to_book(self, position_size: float, side: str) -> float:
+        """Cap a trade to the liquidity available in the order book"""
+        if not self.order_books:
+            return position_size
+        return self.position_sizer.limit_to_liquidity(
+            position_size, self.order_books.book(self.config['symbol']), side
+        )
+
     def execute_trade(self, signal: str, price: float) -> None:
         """Execute trade based on mode"""
         if self.mode == 'simulation':
@@ -63,8 +100,9 @@ class TradingBot:
         """Simulate trade execution"""
         try:
             position_size = self.position_sizer.calculate_position_size(
-                self.position['quote_amount'], price, signal
+                self.position['quote_amount'], price, self.risk_score
             )
+            position_size = self.limit_to_book(position_size, signal)
             if signal == 'buy' and self.position['base_amount'] == 0:
                 cost = position_size * price
                 if cost <= self.position['quote_amount']:
@@ -73,10 +111,10 @@ class TradingBot:
                     self.log_trade('buy', price, position_size)
                     
             elif signal == 'sell' and self.position['base_amount'] > 0:
-                gained = self.position['base_amount'] * price
-                self.position['quote_amount'] += gained
+                amount = self.position['base_amount']
+                self.position['quote_amount'] += amount * price
                 self.position['base_amount'] = 0
-                self.log_trade('sell', price, self.position['base_amount'])
+                self.log_trade('sell', price, amount)
                 
         except Exception as e:
             logging.error(f"Error simulating trade: {e}")
@@ -85,13 +123,14 @@ class TradingBot:
         """Execute real trade using ccxt"""
         try:
             position_size = self.position_sizer.calculate_position_size(
-                self.position['quote_amount'], price, signal
+                self.position['quote_amount'], price, self.risk_score
             )
+            position_size = self.limit_to_book(position_size, signal)
             if signal == 'buy':
-                order = self.exchange.create_market_buy_order(self.config['symbol'], position_size)
+                order = self.price_fetcher.create_market_buy_order(self.config['symbol'], position_size)
                 self.log_trade('buy', price, position_size)
             elif signal == 'sell':
-                order = self.exchange.create_market_sell_order(self.config['symbol'], position_size)
+                order = self.price_fetcher.create_market_sell_order(self.config['symbol'], position_size)
                 self.log_trade('sell', price, position_size)
         except Exception as e:
             logging.error(f"Error executing real trade: {e}")
@@ -107,61 +146,119 @@ class TradingBot:
             'base_balance': self.position['base_amount']
         }
         self.trade_history.append(trade)
+        if self.recorder:
+            self.recorder.record_trade(trade_type, price, amount)
         logging.info(f"Trade executed: {trade}")
 
     def calculate_portfolio_value(self, current_price: float) -> float:
         """Calculate total portfolio value in USDT"""
         return self.position['quote_amount'] + (self.position['base_amount'] * current_price)
 
+    def track_portfolio_value(self, value: float) -> None:
+        """Append a portfolio value and update the running peak and drawdown"""
+        self.portfolio_value_history.append(value)
+        if self.peak_portfolio_value is None or value > self.peak_portfolio_value:
+            self.peak_portfolio_value = value
+        drawdown = (self.peak_portfolio_value - value) / self.peak_portfolio_value
+        self.max_drawdown = max(self.max_drawdown, drawdown)
+
     def calculate_max_drawdown(self) -> float:
-        """Calculate the maximum drawdown from the portfolio value history"""
-        if not self.portfolio_value_history:
-            return 0.0
-        peak = self.portfolio_value_history[0]
-        max_drawdown = 0.0
-        for value in self.portfolio_value_history:
-            if value > peak:
-                peak = value
-            drawdown = (peak - value) / peak
-            if drawdown > max_drawdown:
-                max_drawdown = drawdown
-        return max_drawdown * 100
+        """Maximum drawdown since the bot started, in percent"""
+        return self.max_drawdown * 100
+
+    def get_state(self) -> Dict:
+        """Return the state a replay needs to start from"""
+        return {
+            'config': {
+                key: value for key, value in self.config.items()
+                if key not in ('apiKey', 'apiSecret')
+            },
+            'position': dict(self.position),
+            'price_history': list(self.price_history),
+            'portfolio_value_history': list(self.portfolio_value_history),
+            'peak_portfolio_value': self.peak_portfolio_value,
+            'max_drawdown': self.max_drawdown,
+            'initial_portfolio': self.initial_portfolio
+        }
+
+    def set_state(self, state: Dict) -> None:
+        """Restore state captured by get_state"""
+        self.position = dict(state['position'])
+        self.price_history = list(state['price_history'])
+        self.portfolio_value_history.clear()
+        self.peak_portfolio_value = state.get('peak_portfolio_value')
+        self.max_drawdown = state.get('max_drawdown', 0.0)
+        if self.peak_portfolio_value is None:
+            for value in state['portfolio_value_history']:
+                self.track_portfolio_value(value)
+        else:
+            self.portfolio_value_history.extend(state['portfolio_value_history'])
+        self.initial_portfolio = state['initial_portfolio']
+
+    def replay_tick(self, price: float, timestamp: datetime) -> None:
+        """Process a recorded price as if it had just been fetched"""
+        self.append_price(price)
+        self.process_price(price)
+
+    def process_price(self, price: float) -> None:
+        """Evaluate signals and trade on the latest price"""
+        ema = self.calculate_ema()
+        signal, g_channel_avg = self.calculate_g_channel()
+        if self.recorder:
+            self.recorder.record_signal(signal)
+
+        if ema is not None:
+            if signal == 'buy' and price < ema:
+                logging.info(f"Buy signal detected below EMA: {price} < {ema}")
+                self.execute_trade('buy', price)
+            elif signal == 'sell' and price > ema:
+                logging.info(f"Sell signal detected above EMA: {price} > {ema}")
+                self.execute_trade('sell', price)
+
+        current_portfolio = self.calculate_portfolio_value(price)
+        self.track_portfolio_value(current_portfolio)
+        pnl_percentage = ((current_portfolio - self.initial_portfolio) / self.initial_portfolio) * 100
+        max_drawdown = self.calculate_max_drawdown()
+
+        logging.info(
+            f"Price: ${price:.2f} | Signal: {signal} | "
+            f"Portfolio: ${current_portfolio:.2f} | "
+            f"PnL: {pnl_percentage:+.2f}% | "
+            f"Max Drawdown: {max_drawdown:.2f}%"
+        )
+
+    def step(self) -> None:
+        """Fetch the latest price and act on it"""
+        try:
+            with self.profiler.iteration():
+                price = self.fetch_price()
+                if self.recorder:
+                    self.recorder.record_tick(price, datetime.now())
+                self.process_price(price)
+        except Exception as e:
+            logging.error(f"Error in main loop: {e}")
+
+    def start(self) -> None:
+        """Take the starting portfolio value and begin recording"""
+        self.initial_portfolio = self.calculate_portfolio_value(self.fetch_price())
+        if self.recorder:
+            self.recorder.start(self.get_state())
+
     def run(self) -> None:
-        """Main trading loop"""
+        """Main trading loop, run on update_interval boundaries"""
         logging.info("Starting trading bot with real-time data...")
-        initial_portfolio = self.calculate_portfolio_value(self.fetch_price())
-        
-        while True:
-            try:
-                price = self.fetch_price()
-                ema = self.calculate_ema()
-                signal, g_channel_avg = self.calculate_g_channel()
-
-                if ema is not None:
-                    if signal == 'buy' and price < ema:
-                        logging.info(f"Buy signal detected below EMA: {price} < {ema}")
-                        self.execute_trade('buy', price)
-                    elif signal == 'sell' and price > ema:
-                        logging.info(f"Sell signal detected above EMA: {price} > {ema}")
-                        self.execute_trade('sell', price)
-
-                current_portfolio = self.calculate_portfolio_value(price)
-                self.portfolio_value_history.append(current_portfolio)
-                pnl_percentage = ((current_portfolio - initial_portfolio) / initial_portfolio) * 100
-                max_drawdown = self.calculate_max_drawdown()
-
-                logging.info(
-                    f"Price: ${price:.2f} | Signal: {signal} | "
-                    f"Portfolio: ${current_portfolio:.2f} | "
-                    f"PnL: {pnl_percentage:+.2f}% | "
-                    f"Max Drawdown: {max_drawdown:.2f}%"
-                )
-                
-                time.sleep(self.config['update_interval'])  # Update based on config interval
-                
-            except Exception as e:
-                logging.error(f"Error in main loop: {e}")
-                time.sleep(self.config['update_interval'])
+        self.start()
+
+        scheduler = DeadlineScheduler()
+        scheduler.every(self.config['update_interval'], self.step, name='trading_bot')
+        try:
+            scheduler.run()
+        except KeyboardInterrupt:
+            logging.info("Shutting down trading bot...")
+        finally:
+            self.profiler.stop()
+            if self.recorder:
+                self.recorder.close()
 
 if __name__ == "__main__":
     bot = TradingBot(mode='simulation')  # Change to 'real' for real trading